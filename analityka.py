@@ -0,0 +1,149 @@
+"""Hurtownia danych dziennych w SQLite: jeden wiersz na każdy koniec dnia.
+
+Gra (albo symulacja) zakłada przebieg (`new_run`) i po każdym `end_day` dopisuje
+wiersz przez `record_day`. Wiersze czekają w buforze i trafiają do bazy paczkami,
+w jednej transakcji na paczkę. Baza działa w trybie WAL z synchronous=NORMAL,
+więc zapis nie blokuje czytelników i nie czeka na fsync przy każdym commicie.
+
+Tabele: runs (przebiegi: zapis gry albo ziarno symulacji), days (dzień przebiegu),
+species_days (drzewa/drewno/cena per gatunek), species. Widoki v_* służą do
+analizy trendów, np.:
+
+    SELECT day, avg(worth) FROM v_daily WHERE source = 'symulacja' GROUP BY day;
+    SELECT * FROM v_run_summary ORDER BY final_worth DESC LIMIT 10;
+"""
+import json
+import sqlite3
+import uuid
+from datetime import datetime
+
+DEFAULT_DB = "analityka.db"
+BATCH_DAYS = 64  # rows buffered before a transaction is written
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     INTEGER PRIMARY KEY,
+    run_key    TEXT UNIQUE NOT NULL,
+    source     TEXT NOT NULL,
+    seed       INTEGER,
+    params     TEXT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS species (
+    species_id INTEGER PRIMARY KEY,
+    name       TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS days (
+    run_id          INTEGER NOT NULL REFERENCES runs(run_id),
+    day             INTEGER NOT NULL,
+    money           REAL NOT NULL,
+    debt            REAL NOT NULL,
+    trees           INTEGER NOT NULL,
+    logs            INTEGER NOT NULL,
+    income_tax      REAL NOT NULL DEFAULT 0,
+    property_tax    REAL NOT NULL DEFAULT 0,
+    fire_loss       INTEGER NOT NULL DEFAULT 0,
+    inspection_loss INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS species_days (
+    run_id     INTEGER NOT NULL,
+    day        INTEGER NOT NULL,
+    species_id INTEGER NOT NULL REFERENCES species(species_id),
+    trees      INTEGER NOT NULL,
+    logs       INTEGER NOT NULL,
+    price      REAL NOT NULL,
+    PRIMARY KEY (run_id, day, species_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS days_by_day ON days(day);
+CREATE INDEX IF NOT EXISTS species_days_by_species ON species_days(species_id, day);
+CREATE INDEX IF NOT EXISTS runs_by_source ON runs(source, seed);
+
+CREATE VIEW IF NOT EXISTS v_daily AS
+    SELECT r.source, r.seed, r.run_key, d.*, d.money - d.debt AS worth,
+           d.income_tax + d.property_tax AS taxes
+    FROM days d JOIN runs r USING (run_id);
+CREATE VIEW IF NOT EXISTS v_species_daily AS
+    SELECT r.source, r.seed, sd.run_id, sd.day, s.name AS species, sd.trees, sd.logs, sd.price
+    FROM species_days sd JOIN runs r USING (run_id) JOIN species s USING (species_id);
+CREATE VIEW IF NOT EXISTS v_price_trend AS
+    SELECT day, species, count(*) AS runs, avg(price) AS avg_price, min(price) AS min_price, max(price) AS max_price
+    FROM v_species_daily GROUP BY day, species;
+CREATE VIEW IF NOT EXISTS v_worth_trend AS
+    SELECT source, day, count(*) AS runs, avg(worth) AS avg_worth, min(worth) AS min_worth,
+           max(worth) AS max_worth, avg(debt > 0) AS share_in_debt
+    FROM v_daily GROUP BY source, day;
+CREATE VIEW IF NOT EXISTS v_run_summary AS
+    SELECT r.run_id, r.run_key, r.source, r.seed, r.params,
+           count(*) AS days, min(d.day) AS first_day, max(d.day) AS last_day,
+           (SELECT money - debt FROM days WHERE run_id = r.run_id ORDER BY day DESC LIMIT 1) AS final_worth,
+           max(d.debt) AS max_debt, sum(d.income_tax + d.property_tax) AS taxes_paid,
+           sum(d.fire_loss > 0) AS fires, sum(d.fire_loss) AS trees_burned,
+           sum(d.inspection_loss) AS trees_confiscated
+    FROM runs r JOIN days d USING (run_id) GROUP BY r.run_id;
+"""
+
+
+class Warehouse:
+    def __init__(self, path=DEFAULT_DB, batch_days=BATCH_DAYS, timeout=30.0):
+        self.path = path
+        self.batch_days = batch_days
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        self._species = dict(self.conn.execute("SELECT name, species_id FROM species"))
+        self._days = []
+        self._species_days = []
+
+    # ---------------- runs ----------------
+    def new_run(self, source, seed=None, params=None, run_key=None):
+        """Zwraca run_id; przebieg o tym samym `run_key` (np. z zapisu gry) jest kontynuowany."""
+        run_key = run_key or uuid.uuid4().hex
+        row = self.conn.execute("SELECT run_id FROM runs WHERE run_key = ?", (run_key,)).fetchone()
+        if row:
+            return row[0]
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (run_key, source, seed, params, started_at) VALUES (?, ?, ?, ?, ?)",
+                (run_key, source, seed, json.dumps(params, ensure_ascii=False) if params else None,
+                 datetime.utcnow().isoformat()))
+        return cur.lastrowid
+
+    def species_ids(self, names):
+        missing = [n for n in names if n not in self._species]
+        if missing:
+            with self.conn:
+                self.conn.executemany("INSERT OR IGNORE INTO species (name) VALUES (?)", [(n,) for n in missing])
+            self._species = dict(self.conn.execute("SELECT name, species_id FROM species"))
+        return [self._species[n] for n in names]
+
+    # ---------------- rows ----------------
+    def record_day(self, run_id, day, money, debt, species, trees, logs, prices,
+                   income_tax=0, property_tax=0, fire_loss=0, inspection_loss=0):
+        """Dopisz dzień do bufora. `trees`/`logs`/`prices` w kolejności listy `species`."""
+        self._days.append((run_id, day, money, debt, sum(trees), sum(logs),
+                           income_tax, property_tax, fire_loss, inspection_loss))
+        for sid, t, l, p in zip(self.species_ids(species), trees, logs, prices):
+            self._species_days.append((run_id, day, sid, t, l, p))
+        if len(self._days) >= self.batch_days:
+            self.flush()
+
+    def flush(self):
+        if not self._days:
+            return
+        with self.conn:
+            # INSERT OR REPLACE: a reloaded save may replay days that are already stored
+            self.conn.executemany("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._days)
+            self.conn.executemany("INSERT OR REPLACE INTO species_days VALUES (?, ?, ?, ?, ?, ?)", self._species_days)
+        self._days = []
+        self._species_days = []
+
+    def query(self, sql, params=()):
+        self.flush()
+        return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
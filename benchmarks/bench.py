@@ -0,0 +1,371 @@
+"""Benchmarki reguł gry, zapisu/odczytu i minigier hazardowych (bez okna).
+
+Uruchomienie (z katalogu repozytorium):
+    python benchmarks/bench.py                  # porównaj z benchmarks/baseline.json
+    python benchmarks/bench.py --update-baseline
+    python benchmarks/bench.py -k end_day --threshold 0.3
+
+Gry ładowane są przez bezglowy.py (atrapa Tk/messagebox). Z `--calibrate`
+czasy są skalowane pętlą kalibracyjną, żeby porównać się z baseline zapisanym
+na innej maszynie. Skrypt kończy się kodem 1, gdy któryś przypadek jest
+wolniejszy od baseline o więcej niż `--threshold`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bezglowy  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 1.0   # 2x slower than baseline fails the run (shared machines jitter ~50%)
+HUGE_FOREST = 200_000     # trees per species in the "huge" end_day cases
+LONG_HISTORY = 20_000     # event_log / market_history entries in the "long" save cases
+CHART_DAYS = 100_000      # days of history in the chart cases
+
+CASES = {}
+
+
+def case(name, number=200):
+    """Rejestruje przypadek: funkcja przygotowuje stan i zwraca krok do pomiaru."""
+    def wrap(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return wrap
+
+
+def calibrate():
+    """Stała porcja czystego Pythona - miara szybkości maszyny."""
+    start = time.perf_counter()
+    acc = 0
+    d = {}
+    for i in range(200_000):
+        acc += i % 7
+        d[i & 255] = acc
+    return time.perf_counter() - start
+
+
+def _game(module_name, seed=0):
+    module = bezglowy.load_drzewo() if module_name == "drzewo" else bezglowy.load_kod()
+    return module, bezglowy.new_game(module, seed=seed)
+
+
+# ---------------- single actions ----------------
+def _action_cases(module_name):
+    @case(f"{module_name}.cut_tree")
+    def _cut():
+        _, g = _game(module_name)
+        def step():
+            if g.trees.get(g.selected_tree, 0) < 1:
+                if module_name == "drzewo":
+                    g.trees[g.selected_tree] += 1000
+                else:
+                    g.forest.plant(g.selected_tree, 1000, 30)
+            g.cut_tree()
+        return step
+
+    @case(f"{module_name}.sell_tree")
+    def _sell():
+        _, g = _game(module_name)
+        def step():
+            g.jail = False
+            g.logs[g.selected_tree] = 5
+            g.sell_tree()
+        return step
+
+    @case(f"{module_name}.sell_all_logs")
+    def _sell_all():
+        _, g = _game(module_name)
+        def step():
+            g.jail = False
+            for name in g.logs:
+                g.logs[name] = 20
+            g.sell_all_logs()
+        return step
+
+    @case(f"{module_name}.craft_furniture")
+    def _craft():
+        _, g = _game(module_name)
+        if module_name == "kod":
+            # kod queues orders in the workshop window (made at the end of the day: kod.run_workshop);
+            # the window stays open between orders, like in the game
+            mark = bezglowy.widget_mark()
+            g.craft_furniture()
+            order = bezglowy.widgets_since(mark, "Button")[0]
+            def step():
+                g.craft_furniture()
+                order.invoke()
+                g.workshop.jobs.clear()
+            return step
+        def step():
+            for name in g.logs:
+                g.logs[name] = 2
+            g.home_furniture.clear()
+            mark = bezglowy.widget_mark()
+            g.craft_furniture()
+            bezglowy.widgets_since(mark, "Button")[0].invoke()
+        return step
+
+    if module_name == "kod":
+        @case("kod.run_workshop")
+        def _workshop():
+            _, g = _game("kod")
+            def step():
+                for name in g.logs:
+                    g.logs[name] = 20
+                g.home_furniture.clear()
+                g.workshop.jobs.clear()
+                g.workshop.stock.clear()
+                g.workshop.enqueue("Krzesło", 2)
+                g.run_workshop([])
+            return step
+
+
+# ---------------- end of day ----------------
+def _end_day_cases(module_name):
+    for size, trees in (("small", 5), ("huge", HUGE_FOREST)):
+        @case(f"{module_name}.end_day.{size}", number=20 if size == "huge" else 200)
+        def _end_day(trees=trees):
+            module, g = _game(module_name)
+            if module_name == "drzewo":
+                g.trees = {name: trees for name in g.trees}
+            else:
+                g.forest = module.Forest.from_counts(list(g.trees), {name: trees for name in g.trees})
+            state = g.trees if module_name == "drzewo" else None
+            def step():
+                g.money = 10_000
+                g.debt = 0
+                g.jail = False
+                if state is not None:
+                    # drzewo keeps plain counts; keep the forest from growing between rounds
+                    for name in state:
+                        state[name] = trees
+                    # ...and the tax engine's running tree count in step with them
+                    g.taxes.set_counts(trees=trees * len(state))
+                g.end_day()
+            return step
+
+
+@case("kod.fast_forward.year", number=2)
+def _fast_forward_year():
+    module, g = _game("kod")
+    def step():
+        g.money = 100_000
+        g.debt = 0
+        g.forest = module.Forest.from_counts(list(g.trees), {name: 5 for name in g.trees})
+        g.start_fast_forward(365, stop_on_fire=False, stop_on_jail=False)
+        while g.fast_forward is not None:
+            g._fast_forward_tick()  # bezglowy's after() never fires; drive the frames by hand
+    return step
+
+
+# ---------------- persistence ----------------
+def _persistence_cases():
+    for size, n in (("short", 10), ("long", LONG_HISTORY)):
+        @case(f"kod.save_game.{size}", number=20)
+        def _kod_save(n=n):
+            _, g = _game("kod")
+            g.event_log = [{"time": "2026-01-01T00:00:00", "text": f"zdarzenie {i}"} for i in range(n)]
+            g.market_history = {k: [random.randint(10, 50) for _ in range(n)] for k in g.market_history}
+            return g.save_game
+
+        @case(f"kod.load_from_state.{size}", number=20)
+        def _kod_load(n=n):
+            _, g = _game("kod")
+            g.event_log = [{"time": "2026-01-01T00:00:00", "text": f"zdarzenie {i}"} for i in range(n)]
+            g.market_history = {k: [random.randint(10, 50) for _ in range(n)] for k in g.market_history}
+            data = json.loads(json.dumps(g.get_state()))
+            return lambda: g.load_from_state(data)
+
+    @case("kod.save_game.history_100k", number=20)
+    def _kod_save_history():
+        # autosave every day of a long game: only the new day goes to the history file
+        _, g = _game("kod")
+        g.market_history = {k: [random.randint(10, 50) for _ in range(CHART_DAYS)] for k in g.market_history}
+        g.history = {k: [random.randint(0, 1000) for _ in range(CHART_DAYS)] for k in g.history}
+        g.save_game()
+        def step():
+            for values in g.market_history.values():
+                values.append(random.randint(10, 50))
+            for values in g.history.values():
+                values.append(random.randint(0, 1000))
+            g.save_game()
+        return step
+
+    @case("drzewo.save_game", number=50)
+    def _drzewo_save():
+        module, g = _game("drzewo")
+        return lambda: g.save_game(module.SAVE_FILE)
+
+    @case("drzewo.load_from_dict", number=200)
+    def _drzewo_load():
+        _, g = _game("drzewo")
+        data = json.loads(json.dumps(g.get_state()))
+        return lambda: g.load_from_dict(data)
+
+
+# ---------------- hazard games (drzewo.py) ----------------
+# (open_* method, entry values in creation order, text of the play button)
+HAZARD_GAMES = {
+    "roulette": ("open_roulette", ["czerwony", "5"], "Graj"),
+    "slots": ("open_slots", ["5"], "Graj"),
+    "dice": ("open_dice_game", ["5", "7"], "Graj"),
+    "guess_number": ("open_guess_number", ["5", "50"], "Zgadnij"),
+    "wheel": ("open_wheel", ["5"], "Zakręć"),
+}
+
+
+def _hazard_cases():
+    for game_name, (opener, values, button) in HAZARD_GAMES.items():
+        @case(f"drzewo.hazard.{game_name}")
+        def _play(opener=opener, values=values, button=button):
+            _, g = _game("drzewo")
+            mark = bezglowy.widget_mark()
+            getattr(g, opener)(bezglowy.FakeWidget())
+            for entry, value in zip(bezglowy.widgets_since(mark, "Entry"), values):
+                entry.set(value)
+            play = bezglowy.widgets_since(mark, "Button", button)[0]
+            def step():
+                g.money = 1000
+                g.debt = 0
+                play.invoke()
+            return step
+
+    @case("drzewo.hazard.blackjack")
+    def _blackjack():
+        _, g = _game("drzewo")
+        window = bezglowy.FakeWidget()
+        g.open_blackjack(window)
+        def step():
+            g.money = 1000
+            g.bj_start(window)
+            g.bj_hit(window)
+            g.bj_stand(window)
+        return step
+
+    @case("drzewo.hazard.poker")
+    def _poker():
+        _, g = _game("drzewo")
+        g.open_poker(bezglowy.FakeWidget())
+        return g.poker_draw
+
+    @case("drzewo.hazard.quick_time")
+    def _qte():
+        _, g = _game("drzewo")
+        window = bezglowy.FakeWidget()
+        g.open_quick_time(window)
+        def step():
+            g.money = 1000
+            g.qte_entry.set(" ".join(g.qte_sequence))
+            g.qte_resolve(window)
+        return step
+
+
+# ---------------- charts (wykresy.py) ----------------
+def _chart_cases():
+    import wykresy
+
+    def chart(n_series):
+        rng = random.Random(0)
+        series = [wykresy.Series(f"s{i}", "#000", [rng.randint(10, 50) for _ in range(CHART_DAYS)])
+                  for i in range(n_series)]
+        return wykresy.Chart(bezglowy.FakeWidget(), bezglowy.make_fake_tk(), series, width=580, height=240)
+
+    @case("wykresy.redraw.100k", number=20)
+    def _redraw():
+        return chart(len(bezglowy.load_kod().CONTENT)).redraw
+
+    @case("wykresy.append_day.100k", number=2000)
+    def _append():
+        c = chart(3)
+        lists = [list(s.mins[0]) for s in c.series]
+        c.sync(lists)
+        def step():
+            for values in lists:
+                values.append(30)
+            c.sync(lists)
+        return step
+
+
+_action_cases("drzewo")
+_action_cases("kod")
+_end_day_cases("drzewo")
+_end_day_cases("kod")
+_persistence_cases()
+_hazard_cases()
+_chart_cases()
+
+
+def measure(setup, number, repeat=5):
+    """Czas jednego wywołania (sekundy): najlepsza z `repeat` serii po `number` wywołań.
+
+    Minimum jest mniej wrażliwe na szum (GC, dysk, inne procesy) niż średnia."""
+    random.seed(12345)
+    step = setup()
+    step()  # warm-up
+    rounds = []
+    for _ in range(repeat):
+        random.seed(12345)  # same fires/markets in every round
+        start = time.perf_counter()
+        for _ in range(number):
+            step()
+        rounds.append((time.perf_counter() - start) / number)
+    return min(rounds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarki gry Las Tycoon (bez okna).")
+    parser.add_argument("-k", dest="pattern", default="", help="uruchom tylko przypadki zawierające ten tekst")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--calibrate", action="store_true", help="skaluj baseline szybkością tej maszyny")
+    args = parser.parse_args(argv)
+
+    calib = min(calibrate() for _ in range(5))
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    scale = 1.0
+    if args.calibrate and baseline.get("calibration"):
+        scale = calib / baseline["calibration"]
+
+    results = {}
+    failed = []
+    for name, (setup, number) in CASES.items():
+        if args.pattern not in name:
+            continue
+        t = measure(setup, number, args.repeat)
+        results[name] = t
+        ref = baseline.get("cases", {}).get(name)
+        if ref is None:
+            verdict = "nowy"
+        else:
+            ratio = t / (ref * scale)
+            verdict = f"{ratio:5.2f}x baseline"
+            if ratio > 1.0 + args.threshold:
+                verdict += "  REGRESJA"
+                failed.append(name)
+        print(f"{name:34s} {t*1e6:12.1f} us   {verdict}")
+
+    if args.update_baseline:
+        cases = dict(baseline.get("cases", {}))
+        cases.update(results)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"calibration": calib, "cases": cases}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Zapisano baseline do {BASELINE_FILE}.")
+        return 0
+    if failed:
+        print(f"Regresje ({len(failed)}): " + ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
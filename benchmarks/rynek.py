@@ -0,0 +1,121 @@
+"""Test obciążenia wspólnego rynku (serwer.py): setki botów bez okna przez loopback.
+
+    python benchmarks/rynek.py                          # 200 botów, 20 s
+    python benchmarks/rynek.py --clients 500 --seconds 30 --tick-ms 50
+
+Serwer startuje w osobnym procesie (tak jak przy prawdziwej grze), boty to
+zadania asyncio w tym procesie. Bot ma zapas drewna, co dzień dostaje nowe i w
+każdym ticku z pewną szansą sprzedaje kilka sztuk gatunku o najlepszej cenie
+względem ceny bazowej. Raportujemy percentyle:
+  * tick     - rozliczenie ticku na serwerze (z jego histogramu, granice przedziałów),
+  * delivery - od wysłania ticku przez serwer do odebrania go przez bota,
+  * fill     - od wysłania zlecenia do odebrania rozliczenia (zawiera czekanie na tick).
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import serwer  # noqa: E402
+
+START_LOGS = 200
+LOGS_PER_DAY = 20
+SELL_CHANCE = 0.3   # szansa na zlecenie w ticku (na bota)
+
+
+class Bot:
+    def __init__(self, n, rng):
+        self.rng = rng
+        self.client = serwer.MarketClient(f"bot{n}", on_tick=self.on_tick, on_fill=self.on_fill)
+        self.delivery_ms = []
+        self.fill_ms = []
+        self.income = 0
+        self.logs = []
+
+    async def connect(self, host, port):
+        await self.client.connect(host, port)
+        self.base = [serwer.BASE_PRICES[s] for s in self.client.species]
+        self.logs = [START_LOGS] * len(self.base)
+        return self
+
+    def on_tick(self, msg):
+        self.delivery_ms.append((time.time() - msg["ts"]) * 1000)
+        if "day" in msg:
+            self.logs = [n + LOGS_PER_DAY for n in self.logs]
+        if self.rng.random() < SELL_CHANCE:
+            c = self.client
+            i = max(range(len(self.base)), key=lambda k: (self.logs[k] > 0, c.prices[k] / self.base[k]))
+            qty = min(self.logs[i], self.rng.randint(1, 5))
+            if qty:
+                self.logs[i] -= qty
+                c.sell(i, qty)
+
+    def on_fill(self, order_id, i, qty, price, sent_at):
+        self.income += qty * price
+        if sent_at is not None:
+            self.fill_ms.append((time.perf_counter() - sent_at) * 1000)
+
+
+def percentiles(samples, qs=(0.5, 0.9, 0.99)):
+    if not samples:
+        return [0.0 for _ in qs] + [0.0]
+    samples = sorted(samples)
+    return [samples[min(len(samples) - 1, int(q * len(samples)))] for q in qs] + [samples[-1]]
+
+
+async def load_test(host, port, clients, seconds, seed):
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    bots = await asyncio.gather(*(Bot(n, random.Random(rng.random())).connect(host, port) for n in range(clients)))
+    connect_s = time.perf_counter() - t0
+    tasks = [asyncio.create_task(b.client.run()) for b in bots]
+    await asyncio.sleep(seconds)
+    stats = await bots[0].client.request_stats()
+    for b in bots:
+        await b.client.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return bots, stats, connect_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test obciążenia serwera wspólnego rynku.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--tick-ms", type=int, default=serwer.TICK_MS)
+    parser.add_argument("--ticks-per-day", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "serwer.py"), "--port", "0",
+                             "--tick-ms", str(args.tick_ms), "--ticks-per-day", str(args.ticks_per_day),
+                             "--seed", str(args.seed)], stdout=subprocess.PIPE, text=True)
+    try:
+        host, port = serwer.parse_address(proc.stdout.readline().split()[-1])
+        bots, stats, connect_s = asyncio.run(load_test(host, port, args.clients, args.seconds, args.seed))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    delivery = [x for b in bots for x in b.delivery_ms]
+    fills = [x for b in bots for x in b.fill_ms]
+    tick = stats["tick_us"] or {}
+    print(f"boty: {args.clients}, połączenie: {connect_s * 1000:.0f} ms, ticki: {stats['tick']} "
+          f"(co {args.tick_ms} ms), dni: {stats['day']}, rozłączeni: {stats['dropped']}")
+    print(f"zlecenia: {stats['counters'].get('orders', 0)}, drewno: {stats['counters'].get('volume', 0)}")
+    print(f"{'':10s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+    print(f"{'tick':10s} {tick.get('p50_us', 0) / 1000:8.2f} {'':>8s} {tick.get('p99_us', 0) / 1000:8.2f} "
+          f"{tick.get('max_us', 0) / 1000:8.2f}")
+    for label, samples in (("delivery", delivery), ("fill", fills)):
+        print(f"{label:10s} " + " ".join(f"{v:8.2f}" for v in percentiles(samples)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Czas zimnego startu gry: od uruchomienia procesu do pierwszej klatki okna.
+
+    python benchmarks/startup.py              # drzewo.py i kod, bez zapisu i z dużym zapisem
+    python benchmarks/startup.py --runs 10
+
+Każdy pomiar to osobny proces Pythona (import modułów gry też się liczy).
+Mierzymy:
+  * first_frame - import gry + budowa głównego okna (TycoonGame.__init__),
+  * banner      - kiedy wątek w tle zna nagłówek zapisu (pasek "wznów"),
+  * parsed      - kiedy cały zapis jest już sparsowany w tle.
+Gdy jest wyświetlacz (DISPLAY), używany jest prawdziwy Tk, a pierwsza klatka to
+pierwsze `update()` po zbudowaniu okna; bez wyświetlacza - atrapa z bezglowy.py.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+LONG_HISTORY = 20_000  # event_log / market_history entries in the "large" save
+
+
+def child(game_name, save_path):
+    """Jeden start gry (w osobnym procesie) z zapisem `save_path`. Wypisuje czasy w ms jako JSON."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    real_tk = bool(os.environ.get("DISPLAY"))
+    if real_tk:
+        import importlib.machinery
+        import importlib.util
+        filename = "drzewo.py" if game_name == "drzewo" else "kod"
+        loader = importlib.machinery.SourceFileLoader(f"{game_name}_startup", os.path.join(ROOT, filename))
+        module = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+        loader.exec_module(module)
+        master = module.tk.Tk()
+    else:
+        import bezglowy
+        module = bezglowy.load_drzewo() if game_name == "drzewo" else bezglowy.load_kod()
+        master = bezglowy.FakeWidget()
+    module.SAVE_FILE = save_path
+    module.RESUME_BANNER = True
+    game = module.TycoonGame(master)
+    master.update()
+    out = {"first_frame": (time.perf_counter() - t0) * 1000, "real_tk": real_tk}
+    probe = game.save_probe
+    if probe is not None:
+        while not probe.header_ready:
+            time.sleep(0.0005)
+        out["banner"] = (time.perf_counter() - t0) * 1000
+        probe.wait()
+        out["parsed"] = (time.perf_counter() - t0) * 1000
+    if real_tk:
+        master.destroy()
+    print(json.dumps(out))
+
+
+def make_large_save(game_name, directory):
+    sys.path.insert(0, ROOT)
+    import bezglowy
+    module = bezglowy.load_drzewo() if game_name == "drzewo" else bezglowy.load_kod()
+    game = bezglowy.new_game(module, seed=0)
+    if game_name == "drzewo":
+        game.home_furniture = [{"type": "Stół", "icon": "🪑", "x": i % 5, "y": i % 4} for i in range(LONG_HISTORY)]
+    else:
+        game.event_log = [{"time": "2026-01-01T00:00:00", "text": f"zdarzenie {i}"} for i in range(LONG_HISTORY)]
+        game.market_history = {k: [20 + i % 30 for i in range(LONG_HISTORY)] for k in game.market_history}
+    path = os.path.join(directory, f"{game_name}_large.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(game.get_state(), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def run(game_name, save_path, runs):
+    samples = []
+    for _ in range(runs):
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", game_name]
+        if save_path:
+            cmd.append(save_path)
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Czas zimnego startu gry (time-to-first-frame).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        # no save: a path that does not exist, in a directory removed when the child exits
+        with tempfile.TemporaryDirectory(prefix="las_") as scratch:
+            child(args.child[0], args.child[1] if len(args.child) > 1 else os.path.join(scratch, "brak.json"))
+        return 0
+
+    tmp = tempfile.mkdtemp(prefix="las_startup_")
+    try:
+        for game_name in ("drzewo", "kod"):
+            large = make_large_save(game_name, tmp)
+            size_kb = os.path.getsize(large) // 1024
+            for label, path in (("bez zapisu", None), (f"zapis {size_kb} KB", large)):
+                samples = run(game_name, path, args.runs)
+                line = f"{game_name:7s} {label:16s} first_frame {_median([s['first_frame'] for s in samples]):7.1f} ms"
+                if path:
+                    line += (f" | banner {_median([s['banner'] for s in samples]):7.1f} ms"
+                             f" | parsed {_median([s['parsed'] for s in samples]):7.1f} ms")
+                print(line + ("" if samples[0]["real_tk"] else "  (bez okna)"))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Gra bez okna: ładowanie `drzewo.py` / `kod` z atrapą tkintera.
+
+Symulacje, benchmarki i boty potrzebują prawdziwych reguł `TycoonGame`, ale
+bez wyświetlacza i bez okienek dialogowych. Atrapa udaje widgety Tk (zapamiętuje
+`text`/`command`, żeby dało się "kliknąć" przycisk), a `messagebox` tylko liczy
+wywołania. Moduły gry ładujemy osobno - prawdziwy tkinter w `sys.modules` zostaje
+nietknięty.
+"""
+import importlib.machinery
+import importlib.util
+import multiprocessing.util
+import os
+import random
+import shutil
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeWidget:
+    """Atrapa dowolnego widgetu / okna Tk."""
+    created = []  # recently created widgets, newest last (lets callers find buttons)
+    dropped = 0   # how many old widgets were trimmed from the front of `created`
+
+    def __init__(self, *args, **kwargs):
+        self.options = dict(kwargs)
+        self.value = kwargs.get("value", "")
+        self.children = []
+        FakeWidget.created.append(self)
+        if len(FakeWidget.created) > 10000:
+            del FakeWidget.created[:5000]
+            FakeWidget.dropped += 5000
+
+    def __getattr__(self, name):
+        # pack/grid/place/title/geometry/bind/... all become no-ops
+        return lambda *args, **kwargs: None
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    # Entry / Variable API
+    def get(self, *args):
+        var = self.options.get("textvariable")
+        return var.get() if var is not None else self.value
+
+    def set(self, value):
+        self.value = value
+
+    def insert(self, index, value=""):
+        self.value = f"{self.value}{value}"
+
+    def delete(self, *args):
+        self.value = ""
+
+    def invoke(self):
+        command = self.options.get("command")
+        return command() if command else None
+
+    # Canvas API
+    def create_text(self, *args, **kwargs):
+        return 0
+
+    create_rectangle = create_line = create_oval = create_text
+
+    def coords(self, *args):
+        return [0, 0]
+
+    def curselection(self):
+        return ()
+
+    def after(self, ms, func=None, *args):
+        return "after#0"
+
+    def destroy(self):
+        self.destroyed = True
+
+    def winfo_exists(self):
+        return not self.__dict__.get("destroyed", False)
+
+
+class FakeMessagebox(types.ModuleType):
+    def __init__(self):
+        super().__init__("tkinter.messagebox")
+        self.shown = 0
+        self.answer = False
+
+    def _show(self, *args, **kwargs):
+        self.shown += 1
+
+    showinfo = showwarning = showerror = _show
+
+    def askyesno(self, *args, **kwargs):
+        self.shown += 1
+        return self.answer
+
+
+def make_fake_tk():
+    tk = types.ModuleType("tkinter")
+    for name in ("Tk", "Toplevel", "Canvas", "Label", "Button", "Frame", "Entry", "Text", "Listbox",
+                 "Radiobutton", "OptionMenu", "Scale", "Scrollbar", "Checkbutton",
+                 "StringVar", "IntVar", "DoubleVar", "BooleanVar"):
+        # one subclass per widget kind, so callers can tell Entry from Button
+        setattr(tk, name, type(name, (FakeWidget,), {}))
+    for name in ("LEFT", "RIGHT", "TOP", "BOTTOM", "X", "Y", "BOTH", "END", "WORD",
+                 "DISABLED", "NORMAL", "NONE", "HORIZONTAL", "VERTICAL", "NW", "W", "E", "N", "S"):
+        setattr(tk, name, name.lower())
+    tk.TclError = RuntimeError
+    tk.messagebox = FakeMessagebox()
+    tk.filedialog = types.ModuleType("tkinter.filedialog")
+    tk.filedialog.asksaveasfilename = tk.filedialog.askopenfilename = lambda *a, **k: ""
+    tk.simpledialog = types.ModuleType("tkinter.simpledialog")
+    tk.simpledialog.askinteger = tk.simpledialog.askstring = lambda *a, **k: None
+    return tk
+
+
+def widget_mark():
+    """Znacznik do `widgets_since` - liczba dotąd utworzonych widgetów."""
+    return FakeWidget.dropped + len(FakeWidget.created)
+
+
+def widgets_since(mark, kind=None, text=None):
+    """Widgety utworzone od `mark`, opcjonalnie danego typu i/lub z tekstem zaczynającym się od `text`."""
+    out = []
+    for w in FakeWidget.created[max(0, mark - FakeWidget.dropped):]:
+        if kind is not None and type(w).__name__ != kind:
+            continue
+        if text is not None and not str(w.options.get("text", "")).startswith(text):
+            continue
+        out.append(w)
+    return out
+
+
+_scratch = None
+
+
+def scratch_dir():
+    """Katalog tymczasowy na zapisy gier bez okna - jeden na proces, usuwany przy jego końcu.
+
+    Sprzątanie idzie przez multiprocessing.util.Finalize, a nie atexit: procesy
+    robocze ProcessPoolExecutor kończą się przez os._exit (atexit się nie wykona),
+    a finalizer sprawdza PID, więc proces potomny nie usunie katalogu rodzica."""
+    global _scratch
+    if _scratch is None or _scratch[0] != os.getpid():
+        path = tempfile.mkdtemp(prefix="las_")
+        multiprocessing.util.Finalize(None, shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}, exitpriority=0)
+        _scratch = (os.getpid(), path)
+    return _scratch[1]
+
+
+def load_game_module(filename, name):
+    """Załaduj plik gry jako nowy moduł `name`, z atrapą tkintera na czas importu."""
+    fake = make_fake_tk()
+    saved = {k: sys.modules.get(k) for k in ("tkinter", "tkinter.messagebox", "tkinter.filedialog", "tkinter.simpledialog")}
+    sys.modules.update({"tkinter": fake, "tkinter.messagebox": fake.messagebox,
+                        "tkinter.filedialog": fake.filedialog, "tkinter.simpledialog": fake.simpledialog})
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    try:
+        loader = importlib.machinery.SourceFileLoader(name, os.path.join(HERE, filename))
+        spec = importlib.util.spec_from_loader(name, loader)
+        module = importlib.util.module_from_spec(spec)
+        loader.exec_module(module)
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                sys.modules.pop(k, None)
+            else:
+                sys.modules[k] = v
+    module.fake_tk = fake
+    # saves of headless games never touch the player's savegame.json
+    module.SAVE_FILE = os.path.join(scratch_dir(), f"{name}.json")
+    module.BACKUP_ON_SAVE = False
+    module.ANALYTICS_DB = None    # simulations pass their own analityka.Warehouse
+    module.MARKET_SERVER = None   # never join a shared market (serwer.py), even with LAS_SERWER set
+    module.RESUME_BANNER = False  # no background save probe (its thread would skew benchmarks)
+    return module
+
+
+_modules = {}
+
+
+def load_drzewo():
+    if "drzewo" not in _modules:
+        _modules["drzewo"] = load_game_module("drzewo.py", "drzewo_headless")
+    return _modules["drzewo"]
+
+
+def load_kod():
+    if "kod" not in _modules:
+        _modules["kod"] = load_game_module("kod", "kod_headless")
+    return _modules["kod"]
+
+
+@contextmanager
+def module_constants(module, **constants):
+    """Nadpisz stałe modułu gry (np. FIRE_CHANCE_PER_DAY) na czas bloku `with`.
+
+    Moduły gier są współdzielone w procesie (load_drzewo/load_kod), więc po bloku
+    przywracamy stare wartości - następna gra nie dziedziczy ustawień poprzedniej."""
+    saved = {key: getattr(module, key) for key in constants}
+    for key, value in constants.items():
+        setattr(module, key, value)
+    try:
+        yield module
+    finally:
+        for key, value in saved.items():
+            setattr(module, key, value)
+
+
+def new_game(module, seed=None, autosave=False):
+    """Nowa gra bez okna; inne stałe modułu - przez `module_constants`."""
+    if seed is not None:
+        random.seed(seed)
+    game = module.TycoonGame(FakeWidget())
+    game.autosave = autosave
+    return game
@@ -0,0 +1,471 @@
+"""Boty grające w `drzewo.py`: interfejs agenta, szybki model reguł i MCTS.
+
+Agent dostaje obserwację (`State`, krotka liczb) i model reguł, a zwraca akcję:
+
+    ("cut", i, n)    wytnij n drzew gatunku i
+    ("sell", i, n)   sprzedaj n drewien gatunku i (każda sprzedaż: 12% ryzyka więzienia)
+    ("burn", i, n)   spal n drewien gatunku i
+    ("sell_all",)    sprzedaj całe drewno (ryzyko rośnie z ilością)
+    ("loan", kwota)  weź pożyczkę
+    ("end_day",)     koniec dnia (ceny losowane od nowa, pożar, komornik)
+
+`Model` odtwarza reguły `TycoonGame` na krotkach, bez okien i zapisu - to na nim
+MCTS rozgrywa tysiące symulacji na ruch. Węzły drzewa trzymamy w tablicy
+transpozycji {hash(stan): statystyki}, więc ten sam stan osiągnięty inną kolejnością
+akcji dzieli statystyki. Akcje wykonujemy w prawdziwej grze przez `apply_action`.
+
+    python boty.py turniej --agents prosty,mcts --seeds 10 --days 60 --budget 0.05
+"""
+import argparse
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import bezglowy
+
+MAX_ACTIONS_PER_DAY = 8      # potem zostaje tylko koniec dnia (tury w turnieju i w modelu)
+BATCHES = (1, 5)             # ile drzew / drewien na jedną akcję
+LOAN_AMOUNTS = (100,)
+LOAN_WHEN_BELOW = 50         # pożyczka jest legalna tylko przy pustym koncie
+INSPECTION_CHANCE = 0.10     # drzewo.py: check_inspection_event po każdej akcji
+SELL_JAIL_CHANCE = 0.12      # drzewo.py: sell_tree
+BANKRUPTCY_DEBT = 1000
+ADVISOR_BUDGET_S = 0.5
+DEFAULT_HORIZON = 3          # dni symulowane w każdym rolloucie
+
+State = namedtuple("State", "day money debt jail acts trees logs prices")
+
+
+def observe(game, acts=0):
+    """Obserwacja gry `drzewo.py` jako `State`. `acts` - akcje wykonane dziś."""
+    names = list(game.trees)
+    return State(game.day, game.money, game.debt, bool(game.jail), acts,
+                 tuple(game.trees[n] for n in names), tuple(game.logs.get(n, 0) for n in names),
+                 tuple(game.market_prices[n] for n in names))
+
+
+def apply_action(game, action):
+    """Wykonaj akcję w prawdziwej grze (kliknięcia przycisków)."""
+    names = list(game.trees)
+    kind = action[0]
+    if kind in ("cut", "sell", "burn"):
+        game.selected_tree = names[action[1]]
+        method = {"cut": game.cut_tree, "sell": game.sell_tree, "burn": game.burn_tree}[kind]
+        for _ in range(action[2]):
+            method()
+    elif kind == "sell_all":
+        game.sell_all_logs()
+    elif kind == "loan":
+        game.take_loan(action[1])
+        game.update_stats()
+    else:
+        game.end_day()
+
+
+def describe_action(action, names):
+    kind = action[0]
+    if kind == "cut":
+        return f"Wytnij {action[2]} × {names[action[1]]}"
+    if kind == "sell":
+        return f"Sprzedaj {action[2]} × drewno {names[action[1]]}"
+    if kind == "burn":
+        return f"Spal {action[2]} × drewno {names[action[1]]}"
+    if kind == "sell_all":
+        return "Sprzedaj całe drewno"
+    if kind == "loan":
+        return f"Weź pożyczkę {action[1]} zł"
+    return "Zakończ dzień"
+
+
+class Model:
+    """Reguły `drzewo.py` na krotkach `State` (te same prawdopodobieństwa i kwoty)."""
+
+    def __init__(self, names, base_prices, fuel_values, volatility, fire_chance, loan_rate,
+                 income_rate, tree_tax, furniture_tax, jail_fines, yields=None):
+        self.names = names
+        self.base_prices = base_prices
+        self.fuel_values = fuel_values
+        self.yields = yields or (1,) * len(names)  # logs per cut tree (CONTENT.yield_)
+        self.volatility = volatility
+        self.fire_chance = fire_chance
+        self.loan_rate = loan_rate
+        self.income_rate = income_rate
+        self.tree_tax = tree_tax
+        self.furniture_tax = furniture_tax  # already summed over the furniture in the house
+        self.jail_fines = jail_fines
+        self.n = len(names)
+        self.no_logs = (0,) * self.n
+
+    @classmethod
+    def from_game(cls, game, constants):
+        """Model bieżącej gry; `constants` to słownik stałych modułu (`vars(drzewo)` / `globals()`)."""
+        names = list(game.trees)
+        content = constants["CONTENT"]
+        return cls(names, tuple(constants["BASE_PRICE_TABLE"][n] for n in names),
+                   tuple(constants["FUEL_VALUE_TABLE"].get(n, 0) for n in names),
+                   constants["MARKET_VOLATILITY"], constants["FIRE_CHANCE_PER_DAY"], constants["LOAN_INTEREST_RATE"],
+                   game.taxes.income_rate(game.money), game.taxes.property_rate(),
+                   game.property_tax_per_furniture * sum(game.furniture_counts.values()),
+                   tuple(range(game.jail_min, game.jail_max + 1, 5)),
+                   tuple(content.yield_[content.index[n]] for n in names))
+
+    # ---------------- actions ----------------
+    def legal_actions(self, s):
+        if s.acts >= MAX_ACTIONS_PER_DAY:
+            return [("end_day",)]
+        actions = [("end_day",)]
+        for i in range(self.n):
+            for b in BATCHES:
+                if s.trees[i] >= b:
+                    actions.append(("cut", i, b))
+        if not s.jail:
+            total = 0
+            for i in range(self.n):
+                if s.logs[i]:
+                    total += s.logs[i]
+                    actions.append(("sell", i, 1))
+                    actions.append(("burn", i, s.logs[i]))
+            if total:
+                actions.append(("sell_all",))
+        if s.money < LOAN_WHEN_BELOW and s.debt < BANKRUPTCY_DEBT // 2:
+            actions.extend(("loan", a) for a in LOAN_AMOUNTS)
+        return actions
+
+    def net(self, gross):
+        return gross - int(gross * self.income_rate)
+
+    def _inspection(self, logs, rng):
+        """Inspekcja leśna po akcji (zmienia listę `logs` w miejscu)."""
+        if rng.random() >= INSPECTION_CHANCE:
+            return
+        total = sum(logs)
+        if total <= 0:
+            return
+        for _ in range(rng.randint(1, min(5, total))):
+            available = [i for i in range(self.n) if logs[i] > 0]
+            if not available:
+                break
+            logs[rng.choice(available)] -= 1
+
+    def step(self, s, action, rng):
+        """Następny stan po akcji (losowość z `rng`)."""
+        kind = action[0]
+        if kind == "end_day":
+            return self._end_day(s, rng)
+        day, money, debt, jail, acts, trees, logs, prices = s
+        acts += 1
+        if kind == "cut":
+            i = action[1]
+            n = min(action[2], trees[i])
+            if n > 0:
+                trees = list(trees)
+                logs = list(logs)
+                for _ in range(n):
+                    trees[i] -= 1
+                    logs[i] += self.yields[i]
+                    self._inspection(logs, rng)
+                trees = tuple(trees)
+                logs = tuple(logs)
+        elif kind == "sell" or kind == "burn":
+            i, n = action[1], action[2]
+            logs = list(logs)
+            for _ in range(n):
+                if jail or logs[i] < 1:
+                    break
+                if kind == "sell" and rng.random() < SELL_JAIL_CHANCE:
+                    jail = True
+                    money -= rng.choice(self.jail_fines)
+                else:
+                    money += self.net(prices[i] if kind == "sell" else self.fuel_values[i])
+                    logs[i] -= 1
+                    self._inspection(logs, rng)
+                if money < 0:
+                    debt -= money
+                    money = 0
+            logs = tuple(logs)
+        elif kind == "sell_all":
+            if not jail:
+                total_logs = sum(logs)
+                cash = sum(l * p for l, p in zip(logs, prices))
+                logs = self.no_logs
+                if total_logs > 0:
+                    if rng.random() < 0.06 + max(0, (total_logs - 10) * 0.01):
+                        jail = True
+                        money -= rng.choice(self.jail_fines)
+                    else:
+                        money += self.net(cash)
+                        rng.random()  # inspection roll; nothing left to confiscate
+                if money < 0:
+                    debt -= money
+                    money = 0
+        elif kind == "loan":
+            money += action[1]
+            debt += int(round(action[1] * (1.0 + self.loan_rate)))
+        return State(day, money, debt, jail, acts, trees, logs, prices)
+
+    def _end_day(self, s, rng):
+        day, money, debt, jail, acts, trees, logs, prices = s
+        money -= rng.randint(10, 40)
+        tax = self.tree_tax * sum(trees) + self.furniture_tax
+        if tax > 0:
+            if money >= tax:
+                money -= tax
+            else:
+                debt += tax - max(0, money)
+                money = 0
+        trees = [t + 1 for t in trees]
+        total = sum(trees)
+        if total > 0 and rng.random() < self.fire_chance:
+            for _ in range(rng.randint(1, max(1, total // 4))):
+                available = [i for i in range(self.n) if trees[i] > 0]
+                if not available:
+                    break
+                trees[rng.choice(available)] -= 1
+        if debt > 0:
+            taken = int(debt * 0.1)
+            if money >= taken:
+                money -= taken
+                debt -= taken
+            else:
+                debt += taken
+        v = self.volatility
+        prices = tuple(max(1, int(round(b * (1 + rng.uniform(-v, v))))) for b in self.base_prices)
+        if money < 0:
+            debt -= money
+            money = 0
+        return State(day + 1, money, debt, False, 0, tuple(trees), logs, prices)
+
+    # ---------------- evaluation ----------------
+    def worth(self, s):
+        """Majątek: pieniądze - dług + drewno (po cenie bazowej netto) + połowa wartości drzew."""
+        wood = 0
+        for i in range(self.n):
+            value = self.net(self.base_prices[i])
+            wood += s.logs[i] * value + s.trees[i] * value // 2
+        return s.money - s.debt + wood
+
+
+# ---------------- agents ----------------
+class Agent:
+    """Interfejs: `choose(stan, model)` zwraca akcję z `model.legal_actions(stan)`."""
+    name = "agent"
+
+    def choose(self, state, model):
+        raise NotImplementedError
+
+
+class RandomAgent(Agent):
+    name = "losowy"
+
+    def __init__(self, seed=0, **kwargs):
+        self.rng = random.Random(seed)
+
+    def choose(self, state, model):
+        return self.rng.choice(model.legal_actions(state))
+
+
+class GreedyAgent(Agent):
+    """Prosta strategia: tnij najdroższy gatunek, sprzedawaj hurtem przy dobrych cenach."""
+    name = "prosty"
+
+    def __init__(self, seed=0, keep_trees=3, **kwargs):
+        self.keep_trees = keep_trees
+
+    def choose(self, state, model):
+        return greedy_action(state, model, self.keep_trees)
+
+
+def greedy_action(s, model, keep_trees=3):
+    if s.acts >= MAX_ACTIONS_PER_DAY:
+        return ("end_day",)
+    best, best_price = None, -1
+    for i in range(model.n):
+        if s.trees[i] > keep_trees and s.prices[i] > best_price:
+            best, best_price = i, s.prices[i]
+    if best is not None and s.logs[best] < 10:
+        return ("cut", best, 5 if s.trees[best] - keep_trees >= 5 else 1)
+    total = sum(s.logs)
+    if not s.jail and total:
+        # sell in bulk while the risk is low or prices are above base
+        above = sum(p >= b for p, b in zip(s.prices, model.base_prices)) * 2 >= model.n
+        if total <= 12 or above:
+            return ("sell_all",)
+    return ("end_day",)
+
+
+class MCTSAgent(Agent):
+    """UCT z tablicą transpozycji; każdy ruch dostaje `budget` sekund (albo `rollouts` symulacji)."""
+    name = "mcts"
+
+    def __init__(self, seed=0, budget=ADVISOR_BUDGET_S, rollouts=None, horizon=DEFAULT_HORIZON,
+                 c=1.4, max_table=200_000, **kwargs):
+        self.rng = random.Random(seed)
+        self.budget = budget
+        self.rollouts = rollouts
+        self.horizon = horizon
+        self.c = c
+        self.max_table = max_table
+        self.table = {}          # hash(state) -> [visits, {action: [n, total]}, legal actions]
+        self.last_stats = None
+
+    def choose(self, state, model):
+        legal = model.legal_actions(state)
+        if len(legal) == 1:
+            # nothing to search, but the advisor window still reads the stats
+            self.last_stats = {"rollouts": 0, "table": len(self.table), "actions": [(legal[0], 0, 0.0)]}
+            return legal[0]
+        return self.search(state, model)
+
+    def search(self, root, model):
+        if len(self.table) > self.max_table:
+            self.table.clear()
+        self.lo, self.hi = 0.0, 1.0
+        deadline = time.perf_counter() + self.budget
+        runs = 0
+        while True:
+            self._simulate(root, model)
+            runs += 1
+            if self.rollouts is not None:
+                if runs >= self.rollouts:
+                    break
+            elif runs & 31 == 0 and time.perf_counter() >= deadline:
+                break
+        entry = self.table[hash(root)]
+        ranked = sorted(entry[1].items(), key=lambda kv: -kv[1][0])
+        self.last_stats = {"rollouts": runs, "table": len(self.table),
+                           "actions": [(a, n, w / n if n else 0.0) for a, (n, w) in ranked]}
+        return ranked[0][0]
+
+    def _select(self, entry):
+        visits, stats, legal = entry
+        if len(stats) < len(legal):
+            untried = [a for a in legal if a not in stats]
+            action = self.rng.choice(untried)
+            stats[action] = [0, 0.0]
+            return action
+        log_n = math.log(visits + 1)
+        span = (self.hi - self.lo) or 1.0
+        best, best_score = None, -math.inf
+        for action, (n, total) in stats.items():
+            score = (total / n - self.lo) / span + self.c * math.sqrt(log_n / n) if n else math.inf
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    def _simulate(self, root, model):
+        rng = self.rng
+        state = root
+        end = root.day + self.horizon
+        path = []
+        table = self.table
+        while state.day < end:
+            key = hash(state)
+            entry = table.get(key)
+            if entry is None:
+                table[key] = [0, {}, model.legal_actions(state)]
+                state = self._rollout(state, model, end)
+                break
+            action = self._select(entry)
+            path.append((entry, action))
+            state = model.step(state, action, rng)
+        value = model.worth(state) - model.worth(root)
+        if value < self.lo:
+            self.lo = value
+        if value > self.hi:
+            self.hi = value
+        for entry, action in path:
+            entry[0] += 1
+            st = entry[1][action]
+            st[0] += 1
+            st[1] += value
+
+    def _rollout(self, state, model, end):
+        rng = self.rng
+        while state.day < end:
+            r = rng.random()
+            if r < 0.1:
+                action = ("end_day",)
+            elif r < 0.2:
+                i = rng.randrange(model.n)
+                action = ("cut", i, 1) if state.trees[i] else ("end_day",)
+            else:
+                action = greedy_action(state, model)
+            state = model.step(state, action, rng)
+        return state
+
+
+AGENTS = {"losowy": RandomAgent, "prosty": GreedyAgent, "mcts": MCTSAgent}
+
+
+# ---------------- headless games / tournaments ----------------
+def play(agent, seed, days=60):
+    """Jedna gra `drzewo.py` bez okna. Zwraca słownik z wynikiem."""
+    module = bezglowy.load_drzewo()
+    game = bezglowy.new_game(module, seed=seed)
+    model = Model.from_game(game, vars(module))
+    acts = 0
+    start_day = game.day
+    moves = 0
+    while game.day < start_day + days and game.debt < BANKRUPTCY_DEBT:
+        state = observe(game, acts)
+        action = agent.choose(state, model) if acts < MAX_ACTIONS_PER_DAY else ("end_day",)
+        apply_action(game, action)
+        moves += 1
+        acts = 0 if action[0] == "end_day" else acts + 1
+        model.income_rate = game.taxes.income_rate(game.money)
+    final = observe(game, acts)
+    return {"seed": seed, "days": game.day - start_day, "moves": moves, "money": game.money,
+            "debt": game.debt, "worth": model.worth(final), "bankrupt": game.debt >= BANKRUPTCY_DEBT}
+
+
+def _run_match(task):
+    agent_name, options, seed, days = task
+    agent = AGENTS[agent_name](seed=seed, **options)
+    return agent_name, play(agent, seed, days)
+
+
+def tournament(agent_names, seeds=10, days=60, options=None, workers=None):
+    """Każdy agent gra na tych samych ziarnach. Zwraca {agent: podsumowanie}."""
+    options = options or {}
+    tasks = [(name, options.get(name, {}), seed, days) for name in agent_names for seed in range(seeds)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_match, tasks))
+    table = {}
+    for name in agent_names:
+        games = [r for n, r in results if n == name]
+        worth = sorted(g["worth"] for g in games)
+        table[name] = {"games": len(games),
+                       "worth_mean": sum(worth) / len(worth),
+                       "worth_p50": worth[len(worth) // 2],
+                       "bankruptcy_rate": sum(g["bankrupt"] for g in games) / len(games)}
+    return table
+
+
+def advise(game, constants, budget=ADVISOR_BUDGET_S, acts=0):
+    """Rada dla gracza: (akcja, opis, statystyki wyszukiwania)."""
+    agent = MCTSAgent(seed=random.randrange(1 << 30), budget=budget)
+    model = Model.from_game(game, constants)
+    action = agent.choose(observe(game, acts), model)
+    return action, describe_action(action, model.names), agent.last_stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turniej botów w Las Tycoon (drzewo.py, bez okna).")
+    parser.add_argument("mode", choices=("turniej",))
+    parser.add_argument("--agents", default="losowy,prosty,mcts")
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--budget", type=float, default=0.05, help="sekundy na ruch dla MCTS")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    names = [n for n in args.agents.split(",") if n]
+    results = tournament(names, args.seeds, args.days, {"mcts": {"budget": args.budget}}, args.workers)
+    for name, r in sorted(results.items(), key=lambda kv: -kv[1]["worth_mean"]):
+        print(f"{name:8s} majątek śr. {r['worth_mean']:9.1f} | p50 {r['worth_p50']:7d} "
+              f"| bankructwa {r['bankruptcy_rate']*100:5.1f}% | gier {r['games']}")
+
+
+if __name__ == "__main__":
+    main()
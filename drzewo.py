@@ -6,34 +6,40 @@ import json
 from datetime import datetime
 import os
 
+from podatki import TaxEngine
+import pomiary
+import zawartosc
+from stolarnia import take_any
+from zapisy import HEADER_KEY, SaveProbe, describe_header, make_header
+
 # --- Config / constants ---
 SAVE_FILE = "savegame.json"
 BACKUP_ON_SAVE = True  # Zapisz kopię zapasową z timestampem przy każdym zapisie
-
-TREE_TYPES = [
-    {"name": "Sosna", "color": "#B2B377"},
-    {"name": "Świerk", "color": "#4A6FA5"},
-    {"name": "Dąb", "color": "#C68642"},
-    {"name": "Brzoza", "color": "#EAEAEA"},
-    {"name": "Buk", "color": "#709775"}
-]
-
-FURNITURE_TYPES = {
-    "Stół": {"cost": 3, "icon": "🪑"},
-    "Krzesło": {"cost": 2, "icon": "🪑"},
-    "Szafa": {"cost": 5, "icon": "🗄️"},
-    "Łóżko": {"cost": 4, "icon": "🛏️"}
-}
+RESUME_BANNER = True   # zapis czytany w tle + pasek "wznów" (gry bez okna to wyłączają)
+SAVE_PROBE_POLL_MS = 50
+MARKET_SERVER = os.environ.get("LAS_SERWER")  # "host:port" wspólnego rynku (serwer.py); None = rynek lokalny
+MARKET_POLL_MS = 50
+
+# Gatunki drzew i meble pochodzą z rejestru zawartości (zawartosc.json + mody z LAS_MODY).
+# Reguły czytają tablice CONTENT.price/fuel/yield_ po numerze gatunku; słowniki niżej
+# to widoki dla UI, zapisu, botów i symulacji.
+CONTENT = zawartosc.load()
+TREE_TYPES = CONTENT.tree_types()
+FURNITURE_TYPES = CONTENT.furniture_types()
+CRAFT_LOG_ORDER = sorted(CONTENT.species, key=lambda n: CONTENT.price[CONTENT.index[n]])  # meble zużywają najpierw tanie drewno
 
 LOAN_INTEREST_RATE = 0.23  # 23% jednorazowo doliczane do długu przy zaciągnięciu pożyczki
 FIRE_CHANCE_PER_DAY = 0.08  # 8% szansa na pożar w end_day
 
 # Base price table (bazowe ceny brutto)
-BASE_PRICE_TABLE = {"Sosna": 20, "Świerk": 25, "Dąb": 40, "Brzoza": 15, "Buk": 35}
+BASE_PRICE_TABLE = CONTENT.price_table()
 
 # How much prices can vary from base each day (e.g. 0.2 = ±20%)
 MARKET_VOLATILITY = 0.20
 
+# Wartość opałowa jednego drewna spalonego w domu (zł brutto)
+FUEL_VALUE_TABLE = CONTENT.fuel_table()
+
 class TycoonGame:
     def __init__(self, master):
         self.master = master
@@ -51,7 +57,7 @@ class TycoonGame:
         self.trees = {tree["name"]: 5 for tree in TREE_TYPES}
         # logs = drewno (pozyskiwane przy ścince)
         self.logs = {tree["name"]: 0 for tree in TREE_TYPES}
-        self.selected_tree = TREE_TYPES[0]["name"]
+        self.selected_sid = 0  # numer gatunku w CONTENT (selected_tree to jego nazwa)
         self.jail = False
         self.home_furniture = []
         self.furniture_counts = {name: 0 for name in FURNITURE_TYPES}
@@ -62,11 +68,22 @@ class TycoonGame:
         self.jail_max = 150
         self.day = 1
         self.days_passed = 0
-
-        # Taxes
+        self.autosave = True  # headless simulations turn this off
+        self.income_tax_paid = 0  # suma od startu sesji (analityka liczy z niej podatek dzienny)
+        self.save_probe = None
+        self.resume_banner = None
+        self.resume_requested = False
+        self._windows = {}  # otwarte okna pomocnicze: klucz -> (okno, odśwież)
+        self.market_link = None     # serwer.GameLink, gdy gramy na wspólnym rynku
+        self.market_online = False  # True po powitaniu serwera (sprzedaż idzie przez serwer)
+        self.market_pending = {}    # drewno wysłane na rynek, jeszcze nierozliczone: gatunek -> ilość
+
+        # Taxes (flat rates; the engine keeps running counts of taxable trees/furniture)
+        self.taxes = TaxEngine(brackets=[])
         self.income_tax_rate = 0.10  # 10% tax on sell earnings
         self.property_tax_per_tree = 1  # per tree per day
         self.property_tax_per_furniture = 2  # extra per furniture item per day
+        self.taxes.set_counts(trees=sum(self.trees.values()), furniture=0)
 
         # Market prices (initialized from base)
         self.market_prices = BASE_PRICE_TABLE.copy()
@@ -130,6 +147,13 @@ class TycoonGame:
         self.market_btn = tk.Button(lower_frame, text="📊 Rynek", font=("Helvetica", 12), bg="#6a1b9a", fg="white", command=self.open_market_window)
         self.market_btn.pack(side=tk.LEFT, padx=4)
 
+        self.advisor_btn = tk.Button(lower_frame, text="Doradca 🤖", font=("Helvetica", 12), bg="#00796b", fg="white", command=self.open_advisor)
+        self.advisor_btn.pack(side=tk.LEFT, padx=4)
+
+        if METRICS.enabled:
+            tk.Button(lower_frame, text="Pomiary 📊", font=("Helvetica", 12), bg="#333", fg="white",
+                      command=lambda: pomiary.open_metrics_window(self.master, METRICS, tk)).pack(side=tk.LEFT, padx=4)
+
         self.end_day_btn = tk.Button(master, text="Koniec dnia 🌒", font=("Helvetica", 15, "bold"), bg=self.panel_color, fg=self.text_color, command=self.end_day, height=2, width=22)
         self.end_day_btn.pack(pady=10)
 
@@ -146,42 +170,185 @@ class TycoonGame:
         )
         self.load_btn.pack(padx=6, pady=6)
 
-        # load if exists
+        # load if exists (w tle - okno gry pokazuje się od razu)
         self.load_game_if_exists()
 
+        if MARKET_SERVER:
+            self.connect_market(MARKET_SERVER)
+
         # ensure stats reflect loaded state
         self.update_stats()
 
         # autosave on close
         master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    @property
+    def selected_tree(self):
+        return CONTENT.species[self.selected_sid]
+
+    @selected_tree.setter
+    def selected_tree(self, name):
+        # species missing from the registry (e.g. a mod was removed) fall back to the first one
+        self.selected_sid = CONTENT.index.get(name, 0)
+
+    # ----------------- tax policy (stored in the tax engine) -----------------
+    @property
+    def income_tax_rate(self):
+        return self.taxes.base_income_tax
+
+    @income_tax_rate.setter
+    def income_tax_rate(self, value):
+        self.taxes.set_income_policy(base=value)
+
+    @property
+    def property_tax_per_tree(self):
+        return self.taxes.property_per_tree
+
+    @property_tax_per_tree.setter
+    def property_tax_per_tree(self, value):
+        self.taxes.set_property_policy(per_tree=value)
+
+    @property
+    def property_tax_per_furniture(self):
+        return self.taxes.property_per_furniture
+
+    @property_tax_per_furniture.setter
+    def property_tax_per_furniture(self, value):
+        self.taxes.set_property_policy(per_furniture=value)
+
     # ----------------- market -----------------
     def randomize_market_prices(self, initial=False):
         """Ustaw losowe ceny rynkowe na podstawie BASE_PRICE_TABLE i MARKET_VOLATILITY.
-        Jeśli initial==True -> inicjalizacja przy starcie (może być mniej zmienna)."""
-        for k, base in BASE_PRICE_TABLE.items():
+        Jeśli initial==True -> inicjalizacja przy starcie (może być mniej zmienna).
+        Na wspólnym rynku ceny ustala serwer."""
+        if self.market_online:
+            return
+        for k, base in zip(CONTENT.species, CONTENT.price):
             # We vary by a factor in [-MARKET_VOLATILITY, +MARKET_VOLATILITY]
             # On initial load we still randomize but can be slightly milder (not necessary)
             var = random.uniform(-MARKET_VOLATILITY, MARKET_VOLATILITY)
             self.market_prices[k] = max(1, int(round(base * (1 + var))))
 
     def open_market_window(self):
+        if self._reuse_window("market"):
+            return
         mw = Toplevel(self.master)
         mw.title("Rynek - ceny drewna")
         mw.geometry("360x280")
         mw.configure(bg=self.bg_color)
-        tk.Label(mw, text=f"Ceny (Dzień {self.day})", font=("Helvetica", 14, "bold"), fg=self.text_color, bg=self.bg_color).pack(pady=8)
+        title = tk.Label(mw, font=("Helvetica", 14, "bold"), fg=self.text_color, bg=self.bg_color)
+        title.pack(pady=8)
+        price_labels = {}
         for name in self.market_prices:
-            tk.Label(mw, text=f"{name}: {self.market_prices[name]} zł (brutto)", font=("Helvetica", 13), fg=self.text_color, bg=self.bg_color).pack(anchor="w", padx=10)
-        tk.Button(mw, text="Odśwież (losowe dziś)", command=lambda: (self.randomize_market_prices(), mw.destroy(), self.open_market_window()), bg=self.btn_color).pack(pady=10)
+            price_labels[name] = tk.Label(mw, font=("Helvetica", 13), fg=self.text_color, bg=self.bg_color)
+            price_labels[name].pack(anchor="w", padx=10)
+        def refresh():
+            title.config(text=f"Ceny (Dzień {self.day})")
+            for name, label in price_labels.items():
+                label.config(text=f"{name}: {self.market_prices[name]} zł (brutto)")
+        refresh()
+        self._windows["market"] = (mw, refresh)
+        tk.Button(mw, text="Odśwież (losowe dziś)", command=lambda: (self.randomize_market_prices(), refresh()), bg=self.btn_color).pack(pady=10)
+
+    # ----------------- shared market (serwer.py) -----------------
+    def _send_market_order(self, name, qty):
+        self.market_pending[name] = self.market_pending.get(name, 0) + qty
+        self.market_link.sell(name, qty)
+
+    def connect_market(self, address):
+        """Graj na wspólnym rynku: ceny i zegar dnia z serwera, sprzedaż rozliczana co tick."""
+        import serwer
+        self.market_link = serwer.GameLink(address, name=os.environ.get("USER", "gracz")).start()
+        self.master.after(MARKET_POLL_MS, self._poll_market)
+
+    def _poll_market(self):
+        link = self.market_link
+        if link is None:
+            return
+        sold = []
+        changed = False
+        for event in link.poll():
+            kind = event[0]
+            if kind == "welcome":
+                self.market_online = True
+                self.market_prices.update(event[1])
+                self.end_day_btn.config(state=tk.DISABLED, text="Koniec dnia: wspólny zegar 🌐")
+                changed = True
+            elif kind == "prices":
+                self.market_prices.update(event[1])
+                changed = True
+                if event[2] is not None:
+                    self.end_day()
+            elif kind == "fill":
+                sold.append(event[1:])
+                name, qty = event[1], event[2]
+                left = self.market_pending.get(name, 0) - qty
+                if left > 0:
+                    self.market_pending[name] = left
+                else:
+                    self.market_pending.pop(name, None)
+            elif kind == "closed":
+                self.market_link = None
+                self.market_online = False
+                self.end_day_btn.config(state=tk.NORMAL, text="Koniec dnia 🌒")
+                # orders the server never settled: the logs go back to the player
+                returned = self.market_pending
+                self.market_pending = {}
+                for name, qty in returned.items():
+                    self.logs[name] = self.logs.get(name, 0) + qty
+                note = f"\nNierozliczone drewno wróciło do magazynu: {sum(returned.values())} szt." if returned else ""
+                changed = True
+                messagebox.showwarning("Rynek", f"Brak połączenia z serwerem rynku ({event[1] or 'rozłączono'}).\nGra wraca do rynku lokalnego.{note}")
+        if sold:
+            gross, tax, net = self._apply_income_tax(sum(qty * price for _, qty, price in sold))
+            self.money += net
+            self.check_debt_post_operation()
+            parts = ", ".join(f"{name} {qty} szt. po {price} zł" for name, qty, price in sold)
+            messagebox.showinfo("Sprzedaż", f"Rynek rozliczył: {parts}.\nPrzychód brutto: {gross} zł\nPodatek: {tax} zł\nUzyskano: {net} zł")
+        if sold or changed:
+            entry = self._windows.get("market")
+            if entry and entry[0].winfo_exists():
+                entry[1]()
+            self.update_stats()
+        if self.market_link is not None:
+            self.master.after(MARKET_POLL_MS, self._poll_market)
+
+    # ----------------- advisor (MCTS bot, see boty.py) -----------------
+    def open_advisor(self):
+        import boty
+        action, text, stats = boty.advise(self, globals())
+        aw = Toplevel(self.master)
+        aw.title("Doradca")
+        aw.configure(bg=self.bg_color)
+        tk.Label(aw, text=f"Rada: {text}", font=("Helvetica", 15, "bold"), fg=self.text_color, bg=self.bg_color).pack(pady=8, padx=10)
+        lines = [f"{boty.describe_action(a, list(self.trees))}: {n} symulacji, śr. zysk {gain:+.0f} zł"
+                 for a, n, gain in stats["actions"][:5]]
+        tk.Label(aw, text="\n".join(lines), justify=tk.LEFT, font=("Helvetica", 12), fg=self.text_color, bg=self.bg_color).pack(padx=10)
+        tk.Label(aw, text=f"Symulacji: {stats['rollouts']} (horyzont {boty.DEFAULT_HORIZON} dni)", font=("Helvetica", 10), fg=self.text_color, bg=self.bg_color).pack(pady=4)
+        def follow():
+            aw.destroy()
+            boty.apply_action(self, action)
+        tk.Button(aw, text="Wykonaj", command=follow, bg=self.btn_color, fg="white").pack(pady=8)
+
+    def _reuse_window(self, key):
+        """Jeśli okno `key` jest już otwarte: odśwież je, wysuń na wierzch i zwróć True."""
+        entry = self._windows.get(key)
+        if entry is None or not entry[0].winfo_exists():
+            return False
+        window, refresh = entry
+        refresh()
+        window.deiconify()
+        window.lift()
+        return True
 
     # ----------------- state / save/load -----------------
     def get_state(self):
-        return {
+        state = {
             "money": self.money,
             "debt": self.debt,
             "trees": self.trees,
-            "logs": self.logs,
+            # unsettled market orders are saved as logs still owned (the fill may never arrive)
+            "logs": {n: c + self.market_pending.get(n, 0) for n, c in self.logs.items()} if self.market_pending else self.logs,
             "selected_tree": self.selected_tree,
             "jail": self.jail,
             "home_furniture": self.home_furniture,
@@ -194,8 +361,13 @@ class TycoonGame:
             "market_prices": self.market_prices,
             "last_saved_at": datetime.utcnow().isoformat()
         }
+        # nagłówek na początku pliku - przy starcie czytamy tylko kilka KB
+        return {HEADER_KEY: make_header(state), **state}
 
     def save_game(self, filename=SAVE_FILE):
+        if self.save_probe is not None and filename == SAVE_FILE:
+            # plik zaraz będzie zawierał bieżącą grę - starego zapisu już nie proponujemy
+            self.dismiss_resume_banner()
         data = self.get_state()
         try:
             if BACKUP_ON_SAVE and os.path.exists(filename):
@@ -205,22 +377,70 @@ class TycoonGame:
                     json.dump(data, bf, ensure_ascii=False, indent=2)
             with open(filename, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            if METRICS.enabled:
+                METRICS.count("saves")
+                METRICS.count("bytes_written", os.path.getsize(filename))
             messagebox.showinfo("Zapis", f"Zapisano grę do {filename}.")
         except Exception as e:
             messagebox.showerror("Błąd zapisu", str(e))
 
     def load_game_if_exists(self):
-        try:
-            with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # confirm with user
-            if messagebox.askyesno("Wczytaj zapis", "Znaleziono plik zapisu. Wczytać?"):
-                self.load_from_dict(data)
-                messagebox.showinfo("Wczytano", f"Wczytano zapis. Ostatni zapis: {data.get('last_saved_at')}")
-        except FileNotFoundError:
+        """Start odczytu zapisu w tle. Gdy znamy nagłówek, nad grą pojawia się pasek "wznów"."""
+        if not RESUME_BANNER or not os.path.exists(SAVE_FILE):
+            return
+        self.save_probe = SaveProbe(SAVE_FILE).start()
+        self.master.after(SAVE_PROBE_POLL_MS, self._poll_save_probe)
+
+    def _poll_save_probe(self):
+        probe = self.save_probe
+        if probe is None:
+            return
+        if probe.done and probe.error is not None:
+            self.save_probe = None
+            self.hide_resume_banner()
+            messagebox.showerror("Błąd odczytu zapisu", str(probe.error))
             return
+        if self.resume_banner is None and probe.header_ready and (probe.header or probe.done):
+            self.show_resume_banner(describe_header(probe.header))
+        if probe.done and self.resume_requested:
+            self.resume_saved_game()
+        elif not probe.done:
+            self.master.after(SAVE_PROBE_POLL_MS, self._poll_save_probe)
+
+    def show_resume_banner(self, text):
+        bar = tk.Frame(self.master, bg="#336699")
+        bar.pack(fill=tk.X, before=self.title_label)
+        self.resume_label = tk.Label(bar, text=text, font=("Helvetica", 12), bg="#336699", fg="white")
+        self.resume_label.pack(side=tk.LEFT, padx=8, pady=4)
+        tk.Button(bar, text="Nowa gra", font=("Helvetica", 11), bg=self.warn_color, fg="white", command=self.dismiss_resume_banner).pack(side=tk.RIGHT, padx=4)
+        tk.Button(bar, text="Wczytaj", font=("Helvetica", 11), bg=self.btn_color, fg="white", command=self.resume_saved_game).pack(side=tk.RIGHT, padx=4)
+        self.resume_banner = bar
+
+    def hide_resume_banner(self):
+        if self.resume_banner is not None:
+            self.resume_banner.destroy()
+            self.resume_banner = None
+
+    def dismiss_resume_banner(self):
+        self.save_probe = None
+        self.resume_requested = False
+        self.hide_resume_banner()
+
+    def resume_saved_game(self):
+        probe = self.save_probe
+        if probe is None:
+            return
+        if not probe.done:
+            # jeszcze parsujemy - wczytanie dokończy _poll_save_probe
+            self.resume_requested = True
+            self.resume_label.config(text="Wczytywanie zapisu...")
+            return
+        self.dismiss_resume_banner()
+        try:
+            self.load_from_dict(probe.data)
         except Exception as e:
             messagebox.showerror("Błąd odczytu zapisu", str(e))
+        self.update_stats()
 
     def manual_load_game(self):
         """Ręczne wczytanie gry z przycisku."""
@@ -252,6 +472,12 @@ class TycoonGame:
         self.property_tax_per_furniture = data.get("property_tax_per_furniture", self.property_tax_per_furniture)
         # load market prices if present, otherwise keep current randomized
         self.market_prices = data.get("market_prices", self.market_prices)
+        # species added by mods since the save was made start empty, at base price
+        for sid, name in enumerate(CONTENT.species):
+            self.trees.setdefault(name, 0)
+            self.logs.setdefault(name, 0)
+            self.market_prices.setdefault(name, CONTENT.price[sid])
+        self.taxes.set_counts(trees=sum(self.trees.values()), furniture=sum(self.furniture_counts.values()))
 
     # ----------------- UI / actions -----------------
     def select_tree(self):
@@ -259,6 +485,8 @@ class TycoonGame:
         self.update_stats()
 
     def update_stats(self):
+        if METRICS.enabled:
+            METRICS.count("redraws")
         trees_state = " | ".join([f"{name}: {self.trees.get(name,0)}" for name in self.trees])
         logs_state = " | ".join([f"{name} (drewno): {self.logs.get(name,0)}" for name in self.logs])
         debt_info = f" | DŁUG: {self.debt} zł (komornik!)" if self.debt > 0 else ""
@@ -294,19 +522,21 @@ class TycoonGame:
             messagebox.showwarning("Inspekcja!", msg)
 
             # Autozapis po inspekcji
-            try:
-                self.save_game()
-            except Exception:
-                pass
+            if self.autosave:
+                try:
+                    self.save_game()
+                except Exception:
+                    pass
             self.update_stats()
 
     def cut_tree(self):
         # Cutting produces logs and reduces number of standing trees
         if self.trees.get(self.selected_tree,0) > 0:
-            # yield per tree can vary by species; default 1 log per tree
-            yield_count = 1
+            # yield per tree can vary by species (CONTENT.yield_, default 1 log per tree)
+            yield_count = CONTENT.yield_[self.selected_sid]
             # decrease standing tree
             self.trees[self.selected_tree] -= 1
+            self.taxes.add_trees(-1)
             # increase logs inventory
             self.logs[self.selected_tree] = self.logs.get(self.selected_tree,0) + yield_count
             messagebox.showinfo("Wycięto!", f"Wyciąłeś: {self.selected_tree} i zdobyłeś {yield_count} drewno(drewna).")
@@ -317,8 +547,8 @@ class TycoonGame:
             messagebox.showwarning("Brak drzew!", f"Nie masz więcej drzew typu {self.selected_tree}.")
 
     def _apply_income_tax(self, gross):
-        tax = int(gross * self.income_tax_rate)
-        net = gross - tax
+        gross, tax, net = self.taxes.income_tax(gross, self.money)
+        self.income_tax_paid += tax
         return gross, tax, net
 
     def sell_tree(self):
@@ -334,8 +564,15 @@ class TycoonGame:
             self.go_to_jail()
             self.update_stats()
             return
+        if self.market_online:
+            # shared market: the server settles the order at the end of its tick (see _poll_market)
+            self.logs[self.selected_tree] -= 1
+            self._send_market_order(self.selected_tree, 1)
+            self.check_inspection_event()
+            self.update_stats()
+            return
         # use market price for the selected tree
-        gross = self.market_prices.get(self.selected_tree, BASE_PRICE_TABLE.get(self.selected_tree,0))
+        gross = self.market_prices[self.selected_tree]
         gross, tax, net = self._apply_income_tax(gross)
         # add net to money; if this operation would push money < 0, we still allow and handle debt via check_debt
         self.money += net
@@ -355,8 +592,7 @@ class TycoonGame:
             messagebox.showwarning("Brak drewna!", "Nie masz drewna tego typu.")
             return
         # burning gives "savings" value based on market price fraction (we'll use a smaller number)
-        fuel_value_table = {"Sosna": 5, "Świerk": 7, "Dąb": 10, "Brzoza": 4, "Buk": 9}
-        gross = fuel_value_table.get(self.selected_tree, 0)
+        gross = CONTENT.fuel[self.selected_sid]
         gross, tax, net = self._apply_income_tax(gross)
         self.money += net
         self.logs[self.selected_tree] -= 1
@@ -373,10 +609,13 @@ class TycoonGame:
             return
         total_cash = 0
         total_logs = 0
+        orders = {}
         for name in list(self.logs.keys()):
             logs_to_sell = self.logs.get(name,0)
-            total_cash += logs_to_sell * self.market_prices.get(name, BASE_PRICE_TABLE.get(name,0))
+            total_cash += logs_to_sell * self.market_prices[name]
             total_logs += logs_to_sell
+            if logs_to_sell > 0:
+                orders[name] = logs_to_sell
             self.logs[name] = 0
         risk = 0.06 + max(0, (total_logs-10)*0.01)  # risk adjusted
         if total_logs > 0:
@@ -384,6 +623,12 @@ class TycoonGame:
                 self.go_to_jail()
                 self.update_stats()
                 return
+            if self.market_online:
+                for name, n in orders.items():
+                    self._send_market_order(name, n)
+                self.check_inspection_event()
+                self.update_stats()
+                return
             gross, tax, net = self._apply_income_tax(total_cash)
             self.money += net
             # check for inspection (10% chance)
@@ -420,18 +665,12 @@ class TycoonGame:
             return
 
         def make(name, cost):
-            # now crafting consumes logs (wood), not standing trees
-            available = sum(self.logs.values())
-            if available < cost:
+            # now crafting consumes logs (wood), not standing trees: cheapest species first, per species not per log
+            if take_any(self.logs, cost, CRAFT_LOG_ORDER) is None:
                 messagebox.showwarning("Brak drewna!", f"Potrzebujesz {cost} drewna do wytworzenia mebla {name}.")
                 return False
-            used = 0
-            # consume logs from inventory, arbitrary order
-            for n in list(self.logs.keys()):
-                while self.logs[n] > 0 and used < cost:
-                    self.logs[n] -= 1
-                    used += 1
             self.furniture_counts[name] = self.furniture_counts.get(name,0) + 1
+            self.taxes.add_furniture(1)
             pos = self.find_free_spot()
             if pos:
                 self.home_furniture.append({"type": name, "icon": FURNITURE_TYPES[name]["icon"], "x": pos[0], "y": pos[1]})
@@ -464,6 +703,8 @@ class TycoonGame:
         tk.Label(home_window, text="Meble w domu (przeciągaj by zmieniać pozycję):", font=("Helvetica", 15, "bold"), fg=self.text_color, bg=self.bg_color).pack(pady=8)
         canvas = Canvas(home_window, width=500, height=320, bg="#e0e0e0")
         canvas.pack()
+        if METRICS.enabled:
+            METRICS.count("redraws")
         cell_size = 80
 
         for x in range(5):
@@ -524,7 +765,9 @@ class TycoonGame:
             idx = options.index(select_var.get())
             self.money += self.furniture_sell_price
             furn_type = self.home_furniture[idx]["type"]
-            self.furniture_counts[furn_type] = max(0, self.furniture_counts.get(furn_type,0)-1)
+            if self.furniture_counts.get(furn_type,0) > 0:
+                self.furniture_counts[furn_type] -= 1
+                self.taxes.add_furniture(-1)
             del self.home_furniture[idx]
             self.update_stats()
             messagebox.showinfo("Sprzedaż mebla", f"Sprzedano {furn_type} za {self.furniture_sell_price} zł!")
@@ -536,10 +779,14 @@ class TycoonGame:
 
     # ----------------- hazard (mini-games) -----------------
     def open_hazard_menu(self):
+        if self._reuse_window("hazard"):
+            return
         haz_win = Toplevel(self.master)
         haz_win.title("Hazardowe Mini-Gry")
         haz_win.configure(bg=self.bg_color)
-        tk.Label(haz_win, text=f"Twoje pieniądze: {self.money} zł", font=("Helvetica", 16), fg=self.text_color, bg=self.bg_color).pack(pady=10)
+        money_label = tk.Label(haz_win, text=f"Twoje pieniądze: {self.money} zł", font=("Helvetica", 16), fg=self.text_color, bg=self.bg_color)
+        money_label.pack(pady=10)
+        self._windows["hazard"] = (haz_win, lambda: money_label.config(text=f"Twoje pieniądze: {self.money} zł"))
         tk.Button(haz_win, text="Blackjack 🃏", font=("Helvetica", 15, "bold"),
                   command=lambda: self.open_blackjack(haz_win), width=18, height=2, bg="#43a047", fg="white").pack(pady=5)
         tk.Button(haz_win, text="Poker (Draw) ♠️", font=("Helvetica", 15, "bold"),
@@ -886,9 +1133,7 @@ class TycoonGame:
 
     # ----------------- end of day, taxes, autosave, fire chance -----------------
     def apply_property_tax(self):
-        trees_count = sum(self.trees.values())
-        tax_trees = self.property_tax_per_tree * trees_count
-        tax_furn = self.property_tax_per_furniture * sum(self.furniture_counts.values())
+        tax_trees, tax_furn = self.taxes.property_tax()
         total_tax = tax_trees + tax_furn
         if total_tax <= 0:
             return []
@@ -920,6 +1165,7 @@ class TycoonGame:
         # drzewka rosną (prosty mechanizm: dostajesz 1 nowego drzewa każdego dnia każdego typu)
         for name in self.trees:
             self.trees[name] += 1
+        self.taxes.add_trees(len(self.trees))
 
         # ---- NEW: chance of random fire destroying some trees ----
         total_trees = sum(self.trees.values())
@@ -928,14 +1174,18 @@ class TycoonGame:
             max_loss = max(1, total_trees // 4)
             total_lost = random.randint(1, max_loss)
             lost_details = {}
+            # species that still have trees; kept up to date instead of rebuilt per lost tree
+            available_species = [s for s in self.trees if self.trees[s] > 0]
             for _ in range(total_lost):
                 # choose a random species that still has trees
-                available_species = [s for s in self.trees if self.trees[s] > 0]
                 if not available_species:
                     break
                 s = random.choice(available_species)
                 self.trees[s] -= 1
                 lost_details[s] = lost_details.get(s, 0) + 1
+                if not self.trees[s]:
+                    available_species.remove(s)
+            self.taxes.add_trees(-sum(lost_details.values()))
             # message about fire
             parts = [f"{k}: {v}" for k, v in lost_details.items()]
             charges.append(f"POŻAR! Straciłeś {sum(lost_details.values())} drzew: " + ", ".join(parts))
@@ -956,11 +1206,12 @@ class TycoonGame:
         self.randomize_market_prices()
 
         # autosave after day
-        try:
-            self.save_game()
-            charges.append("Gra została zapisana.")
-        except Exception:
-            pass
+        if self.autosave:
+            try:
+                self.save_game()
+                charges.append("Gra została zapisana.")
+            except Exception:
+                pass
 
         # After all per-day operations, ensure negative money is converted into debt
         self.check_debt_post_operation()
@@ -1027,16 +1278,20 @@ class TycoonGame:
             except ValueError:
                 messagebox.showerror("Błąd", "Podaj poprawną kwotę (liczba całkowita).")
                 return
-            # grant money and add interest to debt
-            self.money += amt
-            added_debt = int(round(amt * (1.0 + LOAN_INTEREST_RATE)))
-            # You requested that interest is 23% of the borrowed amount — here we add principal+interest to debt
-            self.debt += added_debt
+            added_debt = self.take_loan(amt)
             messagebox.showinfo("Pożyczka", f"Pożyczono {amt} zł.\nDo długu dopisano kwotę: {added_debt} zł (principal + {int(LOAN_INTEREST_RATE*100)}% odsetek).")
             self.update_stats()
             lw.destroy()
         tk.Button(lw, text="Weź pożyczkę", command=take, bg="#aa8844").pack(pady=8)
 
+    def take_loan(self, amt):
+        """Wypłać pożyczkę i dopisz principal + odsetki do długu. Zwraca dopisaną kwotę."""
+        self.money += amt
+        added_debt = int(round(amt * (1.0 + LOAN_INTEREST_RATE)))
+        # You requested that interest is 23% of the borrowed amount — here we add principal+interest to debt
+        self.debt += added_debt
+        return added_debt
+
     # ----------------- save on close -----------------
     def on_closing(self):
         if messagebox.askyesno("Zapis", "Chcesz zapisać przed wyjściem?"):
@@ -1044,9 +1299,14 @@ class TycoonGame:
                 self.save_game()
             except Exception:
                 pass
+        if self.market_link is not None:
+            self.market_link.close()
         self.master.destroy()
 
 # ----------------- run -----------------
+# timers/counters are only installed when LAS_POMIARY is set (see pomiary.py)
+METRICS = pomiary.install(globals())
+
 if __name__ == "__main__":
     root = tk.Tk()
     game = TycoonGame(root)
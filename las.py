@@ -0,0 +1,214 @@
+"""Las z kohortami wiekowymi (Forest).
+
+Drzewa każdego gatunku trzymamy jako liczności w kohortach wieku (0..max_age-1,
+ostatnia kohorta zbiera wszystkie starsze drzewa) w jednej płaskiej tablicy
+`array('q')`. Kohorty są buforem cyklicznym: starzenie się lasu to przesunięcie
+wskaźnika `head`, a nie przepisywanie tablicy, więc koszt dnia zależy od liczby
+gatunków, a nie od liczby drzew.
+
+Słownik `trees` ({gatunek: liczba}) da się zawsze odtworzyć (`counts()`), więc
+stare UI i format zapisu dalej działają.
+"""
+import math
+import random
+from array import array
+
+FOREST_MAX_AGE = 64       # liczba kohort wieku; najstarsza zbiera wszystko co starsze
+MATURITY_AGE = 20         # wiek (dni), w którym drzewo osiąga połowę docelowej wydajności
+GROWTH_STEEPNESS = 5.0    # jak szybko rośnie krzywa logistyczna wokół MATURITY_AGE
+MAX_YIELD = 3             # drewno z dojrzałego drzewa
+START_TREE_AGE = 30       # drzewa startowe / wczytane ze starych zapisów są dojrzałe
+YOUNG_FIRE_FACTOR = 2.0   # młodniki palą się dwa razy łatwiej niż stary drzewostan
+
+
+def growth(age):
+    """Krzywa wzrostu (0..1) - logistyczna względem wieku w dniach."""
+    return 1.0 / (1.0 + math.exp(-(age - MATURITY_AGE) / GROWTH_STEEPNESS))
+
+
+def log_yield(age):
+    """Ile drewna daje ścięcie drzewa w danym wieku (zawsze co najmniej 1)."""
+    return max(1, int(round(MAX_YIELD * growth(age))))
+
+
+def fire_susceptibility(age):
+    """Względna podatność na pożar: młode drzewa palą się łatwiej."""
+    return 1.0 + (YOUNG_FIRE_FACTOR - 1.0) * (1.0 - growth(age))
+
+
+class Forest:
+    __slots__ = ("species", "index", "max_age", "head", "cohorts", "totals",
+                 "yield_table", "fire_table")
+
+    def __init__(self, species, max_age=FOREST_MAX_AGE):
+        self.species = list(species)
+        self.index = {name: i for i, name in enumerate(self.species)}
+        self.max_age = max_age
+        self.head = 0  # slot kohorty w wieku 0
+        self.cohorts = array("q", bytes(8 * len(self.species) * max_age))
+        self.totals = array("q", bytes(8 * len(self.species)))
+        self.yield_table = array("q", (log_yield(a) for a in range(max_age)))
+        self.fire_table = array("d", (fire_susceptibility(a) for a in range(max_age)))
+
+    # ---------------- indexing helpers ----------------
+    def _slot(self, sid, age):
+        return sid * self.max_age + (self.head - age) % self.max_age
+
+    def count(self, name):
+        sid = self.index.get(name)
+        return self.totals[sid] if sid is not None else 0
+
+    def counts(self):
+        """Słownik {gatunek: liczba drzew} dla UI i zapisu."""
+        return dict(zip(self.species, self.totals))
+
+    def total(self):
+        return sum(self.totals)
+
+    def age_profile(self, name):
+        """Liczności kohort gatunku od najmłodszej do najstarszej."""
+        sid = self.index[name]
+        return [self.cohorts[self._slot(sid, a)] for a in range(self.max_age)]
+
+    # ---------------- mutations ----------------
+    def plant(self, name, n, age=0):
+        if n <= 0:
+            return
+        sid = self.index[name]
+        age = min(max(0, age), self.max_age - 1)
+        self.cohorts[self._slot(sid, age)] += n
+        self.totals[sid] += n
+
+    def advance_day(self, planted=1):
+        """Wszystkie drzewa starzeją się o dzień, każdy gatunek dostaje `planted` sadzonek.
+
+        Przesuwamy `head`; slot, który staje się nową kohortą zerową, to dotychczasowa
+        najstarsza kohorta - jej zawartość dosypujemy do kohorty max_age-1.
+        """
+        m = self.max_age
+        self.head = (self.head + 1) % m
+        cohorts = self.cohorts
+        totals = self.totals
+        for sid in range(len(self.species)):
+            base = sid * m
+            oldest = cohorts[base + self.head]
+            cohorts[base + (self.head + 1) % m] += oldest
+            cohorts[base + self.head] = planted
+            totals[sid] += planted
+
+    def harvest(self, name, n=1):
+        """Wytnij do `n` drzew gatunku, od najstarszych. Zwraca (ścięte, drewno)."""
+        sid = self.index.get(name)
+        if sid is None or n <= 0:
+            return 0, 0
+        cut = 0
+        logs = 0
+        cohorts = self.cohorts
+        for age in range(self.max_age - 1, -1, -1):
+            if cut >= n:
+                break
+            slot = self._slot(sid, age)
+            take = min(cohorts[slot], n - cut)
+            if take:
+                cohorts[slot] -= take
+                cut += take
+                logs += take * self.yield_table[age]
+        self.totals[sid] -= cut
+        return cut, logs
+
+    def remove(self, name, n, weights=None):
+        """Usuń `n` drzew gatunku rozkładając straty po kohortach proporcjonalnie do
+        liczności (opcjonalnie ważonych, np. podatnością na pożar). Zwraca usunięte."""
+        sid = self.index.get(name)
+        if sid is None:
+            return 0
+        n = min(n, self.totals[sid])
+        if n <= 0:
+            return 0
+        cohorts = self.cohorts
+        slots = [self._slot(sid, a) for a in range(self.max_age)]
+        w = [cohorts[s] * (weights[a] if weights else 1.0) for a, s in enumerate(slots)]
+        total_w = sum(w)
+        removed = 0
+        for a, s in enumerate(slots):
+            take = min(cohorts[s], int(n * w[a] / total_w))
+            cohorts[s] -= take
+            removed += take
+        # remainder from the most exposed cohorts that still have trees
+        if removed < n:
+            for a in sorted(range(self.max_age), key=lambda a: -w[a]):
+                s = slots[a]
+                take = min(cohorts[s], n - removed)
+                cohorts[s] -= take
+                removed += take
+                if removed >= n:
+                    break
+        self.totals[sid] -= removed
+        return removed
+
+    def fire(self, total_lost, rng=random):
+        """Pożar: `total_lost` drzew rozdzielonych między gatunki wg ich podatności.
+
+        Zwraca {gatunek: spalone}."""
+        exposure = []
+        for sid in range(len(self.species)):
+            if self.totals[sid] <= 0:
+                exposure.append(0.0)
+                continue
+            base = sid * self.max_age
+            e = 0.0
+            for age in range(self.max_age):
+                c = self.cohorts[base + (self.head - age) % self.max_age]
+                if c:
+                    e += c * self.fire_table[age]
+            exposure.append(e)
+        lost = {}
+        remaining = min(total_lost, self.total())
+        while remaining > 0:
+            if sum(exposure) <= 0:
+                break
+            sid = rng.choices(range(len(self.species)), weights=exposure)[0]
+            # burn a proportional chunk of the drawn species in one step
+            share = max(1, remaining * self.totals[sid] // max(1, self.total()))
+            burned = self.remove(self.species[sid], min(share, remaining), self.fire_table)
+            if burned:
+                lost[self.species[sid]] = lost.get(self.species[sid], 0) + burned
+                remaining -= burned
+            if self.totals[sid] <= 0:
+                exposure[sid] = 0.0
+        return lost
+
+    def remove_random(self, n, rng=random):
+        """Usuń `n` losowych drzew (gatunek proporcjonalnie do liczności). Zwraca {gatunek: n}."""
+        removed = {}
+        for _ in range(min(n, self.total())):
+            sid = rng.choices(range(len(self.species)), weights=self.totals)[0]
+            if self.remove(self.species[sid], 1):
+                removed[self.species[sid]] = removed.get(self.species[sid], 0) + 1
+        return removed
+
+    # ---------------- save / load ----------------
+    def to_dict(self):
+        return {
+            "max_age": self.max_age,
+            "cohorts": {name: self.age_profile(name) for name in self.species},
+        }
+
+    @classmethod
+    def from_dict(cls, species, data):
+        forest = cls(species, data.get("max_age", FOREST_MAX_AGE))
+        for name, profile in data.get("cohorts", {}).items():
+            if name not in forest.index:
+                continue
+            for age, n in enumerate(profile[:forest.max_age]):
+                forest.plant(name, n, age)
+        return forest
+
+    @classmethod
+    def from_counts(cls, species, counts, age=START_TREE_AGE):
+        """Las z samych liczności (stare zapisy) - wszystkie drzewa w jednej kohorcie."""
+        forest = cls(species)
+        for name, n in counts.items():
+            if name in forest.index:
+                forest.plant(name, n, age)
+        return forest
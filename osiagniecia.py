@@ -0,0 +1,153 @@
+"""Osiągnięcia: reguły zapisane na zdarzenia gry, liczone przyrostowo.
+
+Reguły leżą w rejestrze zawartości (`zawartosc.json` -> "achievements", mody
+mogą dopisywać własne). Reguła mówi, na jakie zdarzenie czeka (EVENTS), co liczy
+(`kind`) i od jakiego progu (`goal`) jest odblokowana:
+  * "count"  - liczba zdarzeń,
+  * "sum"    - suma pola `field` zdarzenia (np. przychód ze sprzedaży),
+  * "max"    - największa wartość pola `field` (np. pieniądze na koniec dnia),
+  * "streak" - ile zdarzeń z rzędu miało `field` <= `limit` (np. dni bez długu).
+`filter` ({pole: wartość}) zawęża zdarzenia, np. tylko wycięte dęby.
+
+Reguły liczące to samo (zdarzenie, rodzaj, pole, filtr, limit) dzielą jeden
+licznik - "ścieżkę" - z posortowaną listą progów. Zdarzenie aktualizuje tylko
+ścieżki na nie zapisane i sprawdza jeden, najbliższy próg, więc koszt akcji nie
+zależy od liczby osiągnięć (progi "100/1000/10000 cięć" to jedna ścieżka) ani
+od długości gry. Ścieżka bez progów do zdobycia wypisuje się ze zdarzenia.
+"""
+from bisect import insort
+
+EVENTS = ("sale", "cut", "day_end", "jail", "loan", "casino_win")
+KINDS = ("count", "sum", "max", "streak")
+
+
+class Rule:
+    __slots__ = ("name", "icon", "description", "event", "kind", "field", "goal", "filter", "limit", "key")
+
+    def __init__(self, name, event, kind="count", goal=1, field=None, filter=None, limit=0, icon="🏆", description=""):
+        if event not in EVENTS:
+            raise ValueError(f"osiągnięcie {name!r}: nieznane zdarzenie {event!r}")
+        if kind not in KINDS:
+            raise ValueError(f"osiągnięcie {name!r}: nieznany rodzaj {kind!r}")
+        if kind != "count" and not field:
+            raise ValueError(f"osiągnięcie {name!r}: rodzaj {kind!r} wymaga pola `field`")
+        self.name = name
+        self.icon = icon
+        self.description = description
+        self.event = event
+        self.kind = kind
+        self.field = field
+        self.goal = goal
+        self.filter = tuple(sorted((filter or {}).items()))
+        self.limit = limit
+        self.key = self.track_key()
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d["event"], d.get("kind", "count"), d.get("goal", 1), d.get("field"),
+                   d.get("filter"), d.get("limit", 0), d.get("icon", "🏆"), d.get("description", ""))
+
+    def track_key(self):
+        """Reguły o tym samym kluczu liczą ten sam licznik (klucz trafia też do zapisu)."""
+        key = f"{self.event}:{self.kind}"
+        if self.field:
+            key += f":{self.field}"
+        if self.kind == "streak":
+            key += f"<={self.limit}"
+        for k, v in self.filter:
+            key += f"[{k}={v}]"
+        return key
+
+
+class Track:
+    __slots__ = ("key", "kind", "field", "filter", "limit", "value", "goals")
+
+    def __init__(self, rule):
+        self.key = rule.key
+        self.kind = rule.kind
+        self.field = rule.field
+        self.filter = rule.filter
+        self.limit = rule.limit
+        self.value = 0
+        self.goals = []  # (goal, rule name) still to unlock, ascending
+
+    def update(self, payload):
+        """Aktualizuj licznik; zwraca nazwy reguł, których próg właśnie osiągnięto."""
+        for k, v in self.filter:
+            if payload.get(k) != v:
+                return ()
+        kind = self.kind
+        if kind == "count":
+            self.value += 1
+        elif kind == "sum":
+            self.value += payload.get(self.field, 0)
+        elif kind == "max":
+            value = payload.get(self.field, 0)
+            if value > self.value:
+                self.value = value
+        elif payload.get(self.field, 0) <= self.limit:
+            self.value += 1
+        else:
+            self.value = 0
+        goals = self.goals
+        if not goals or self.value < goals[0][0]:
+            return ()
+        reached = []
+        while goals and self.value >= goals[0][0]:
+            reached.append(goals.pop(0)[1])
+        return reached
+
+
+class Achievements:
+    """Odblokowane osiągnięcia i liczniki; `emit` zwraca nowo odblokowane reguły.
+
+    `unlocked` (nazwy) i `progress` ({klucz ścieżki: licznik}) przychodzą z zapisu;
+    nazwy spoza `rules` (np. z odinstalowanego moda) są pomijane."""
+
+    def __init__(self, rules, unlocked=(), progress=None):
+        progress = progress or {}
+        self.rules = {r.name: r for r in rules}
+        self.unlocked = {name for name in unlocked if name in self.rules}  # rules removed with a mod
+        self.tracks = {}
+        self.listeners = {}  # event -> tracks with goals left
+        for rule in self.rules.values():
+            track = self.tracks.get(rule.key)
+            if track is None:
+                track = self.tracks[rule.key] = Track(rule)
+                track.value = progress.get(rule.key, 0)
+            if rule.name not in self.unlocked:
+                if not track.goals:
+                    self.listeners.setdefault(rule.event, []).append(track)
+                insort(track.goals, (rule.goal, rule.name))
+
+    def __len__(self):
+        return len(self.unlocked)
+
+    def __contains__(self, name):
+        return name in self.unlocked
+
+    def __iter__(self):
+        return iter(self.unlocked)
+
+    def emit(self, event, payload):
+        tracks = self.listeners.get(event)
+        if not tracks:
+            return []
+        unlocked = []
+        for track in tracks:
+            for name in track.update(payload):
+                if name not in self.unlocked:
+                    self.unlocked.add(name)
+                    unlocked.append(self.rules[name])
+        if unlocked:
+            self.listeners[event] = [t for t in tracks if t.goals]
+        return unlocked
+
+    def progress(self, name):
+        """(licznik, próg) reguły `name`."""
+        rule = self.rules[name]
+        return self.tracks[rule.key].value, rule.goal
+
+    # ---------------- save ----------------
+    def progress_dict(self):
+        return {key: track.value for key, track in self.tracks.items() if track.value}
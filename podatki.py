@@ -0,0 +1,160 @@
+"""Silnik podatkowy: progi dochodowe, podatek od majątku i dzienny rejestr podatków.
+
+Stawki są zapamiętywane. Stawka dochodowa liczona jest ponownie tylko wtedy,
+gdy saldo wyjdzie poza przedział bieżącego progu albo zmieni się polityka.
+Stawka od drzewa zmienia się tylko razem z cenami rynkowymi. Liczbę
+opodatkowanych drzew i mebli trzymamy jako sumy bieżące, więc dzienny podatek
+od majątku nie sumuje już słowników.
+"""
+import csv
+import json
+from bisect import bisect_left
+
+# (próg salda, dodatek do stawki) - saldo powyżej progu podnosi stawkę
+INCOME_BRACKETS = [(1000, 0.02), (2000, 0.05), (5000, 0.10)]
+MAX_INCOME_TAX = 0.6
+TAX_LEDGER_DAYS = 3650  # ile dni rejestru trzymamy w zapisie gry
+
+
+class TaxEngine:
+    def __init__(self, base_income_tax=0.10, brackets=INCOME_BRACKETS, max_rate=MAX_INCOME_TAX,
+                 property_per_tree=1, property_per_furniture=0, price_anchor=None, price_step=30):
+        self.thresholds = [t for t, _ in sorted(brackets)]
+        self.extras = [0.0] + [e for _, e in sorted(brackets)]
+        self.max_rate = max_rate
+        self.base_income_tax = base_income_tax
+        self.income_fluctuation = 0.0
+        self.property_per_tree = property_per_tree
+        self.property_fluctuation = 0.0
+        self.property_per_furniture = property_per_furniture
+        # price_anchor=None turns off the market price component of the tree tax
+        self.price_anchor = price_anchor
+        self.price_step = price_step
+        self.taxable_trees = 0
+        self.taxable_furniture = 0
+        self._avg_price = 0.0
+        self._income_lo = self._income_hi = None
+        self._income_rate = 0.0
+        self._tree_rate = None
+
+    # ---------------- policy ----------------
+    def set_income_policy(self, base=None, fluctuation=None):
+        if base is not None:
+            self.base_income_tax = base
+        if fluctuation is not None:
+            self.income_fluctuation = fluctuation
+        self._income_lo = self._income_hi = None
+
+    def set_property_policy(self, per_tree=None, fluctuation=None, per_furniture=None):
+        if per_tree is not None:
+            self.property_per_tree = per_tree
+        if fluctuation is not None:
+            self.property_fluctuation = fluctuation
+        if per_furniture is not None:
+            self.property_per_furniture = per_furniture
+        self._tree_rate = None
+
+    def prices_changed(self, prices):
+        self._avg_price = sum(prices.values()) / len(prices) if prices else 0.0
+        self._tree_rate = None
+
+    # ---------------- rates ----------------
+    def income_rate(self, money):
+        """Stawka podatku dochodowego dla salda `money` (z pamięci, póki saldo w tym samym progu)."""
+        lo, hi = self._income_lo, self._income_hi
+        if lo is not None and lo < money <= hi:
+            return self._income_rate
+        idx = bisect_left(self.thresholds, money)
+        self._income_lo = self.thresholds[idx - 1] if idx > 0 else float("-inf")
+        self._income_hi = self.thresholds[idx] if idx < len(self.thresholds) else float("inf")
+        rate = self.base_income_tax + self.extras[idx] + self.income_fluctuation
+        self._income_rate = max(0.0, min(self.max_rate, rate))
+        return self._income_rate
+
+    def income_tax(self, gross, money):
+        """(brutto, podatek, netto) dla przychodu `gross` przy saldzie `money`."""
+        tax = int(gross * self.income_rate(money))
+        return gross, tax, gross - tax
+
+    def property_rate(self):
+        """Podatek od jednego drzewa na dzień."""
+        if self._tree_rate is None:
+            rate = self.property_per_tree + round(self.property_fluctuation * 3)
+            if self.price_anchor is not None:
+                rate += int((self._avg_price - self.price_anchor) / self.price_step)
+            self._tree_rate = max(0, int(rate))
+        return self._tree_rate
+
+    # ---------------- taxable counts ----------------
+    def set_counts(self, trees=None, furniture=None):
+        if trees is not None:
+            self.taxable_trees = trees
+        if furniture is not None:
+            self.taxable_furniture = furniture
+
+    def add_trees(self, delta):
+        self.taxable_trees += delta
+
+    def add_furniture(self, delta):
+        self.taxable_furniture += delta
+
+    def property_tax(self):
+        """(od drzew, od mebli) na dziś z bieżących sum."""
+        return (self.property_rate() * self.taxable_trees,
+                self.property_per_furniture * self.taxable_furniture)
+
+
+class TaxLedger:
+    """Rejestr podatków dzień po dniu: {dzień: {rodzaj: kwota}}."""
+
+    def __init__(self, max_days=TAX_LEDGER_DAYS):
+        self.days = {}
+        self.max_days = max_days
+
+    def record(self, day, kind, amount):
+        if not amount:
+            return
+        row = self.days.get(day)
+        if row is None:
+            row = self.days[day] = {}
+            if len(self.days) > self.max_days:
+                del self.days[min(self.days)]
+        row[kind] = row.get(kind, 0) + amount
+
+    def query(self, start=None, end=None, kind=None):
+        """Wiersze (dzień, rodzaj, kwota) z przedziału dni [start, end]."""
+        out = []
+        for day in sorted(self.days):
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            for k, amount in self.days[day].items():
+                if kind is None or k == kind:
+                    out.append((day, k, amount))
+        return out
+
+    def totals(self, start=None, end=None):
+        out = {}
+        for _, k, amount in self.query(start, end):
+            out[k] = out.get(k, 0) + amount
+        return out
+
+    def export(self, path):
+        """Eksport do CSV (albo JSON, jeśli ścieżka kończy się na .json)."""
+        rows = self.query()
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"day": d, "kind": k, "amount": a} for d, k, a in rows], f, ensure_ascii=False, indent=2)
+            return
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["day", "kind", "amount"])
+            writer.writerows(rows)
+
+    def to_dict(self):
+        return {str(day): row for day, row in self.days.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        ledger = cls()
+        ledger.days = {int(day): dict(row) for day, row in (data or {}).items()}
+        return ledger
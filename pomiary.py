@@ -0,0 +1,248 @@
+"""Pomiary czasu akcji i podsystemów gry (włączane zmienną środowiskową).
+
+    LAS_POMIARY=1 python kod                # pomiary + okno "Pomiary 📊"
+    LAS_POMIARY=pomiary.jsonl python kod    # ... i zrzut do pliku przy wyjściu
+    LAS_POMIARY=pomiary.prom python kod     # zrzut w formacie tekstowym Prometheusa
+
+Gdy pomiary są wyłączone, `install` nic nie podmienia - metody gry zostają
+oryginalne, więc koszt to jedno sprawdzenie `METRICS.enabled` w kilku miejscach.
+Po włączeniu wybrane metody są opakowywane licznikiem czasu, a czasy trafiają do
+histogramów o stałych (logarytmicznych) przedziałach.
+"""
+import atexit
+import functools
+import json
+import os
+import time
+import types
+from bisect import bisect_left
+from datetime import datetime
+
+ENV_VAR = "LAS_POMIARY"
+
+# bucket upper bounds in microseconds (Prometheus "le"), the last bucket is +Inf
+BUCKETS_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10_000, 25_000, 50_000,
+              100_000, 250_000, 500_000, 1_000_000, 2_500_000, 10_000_000)
+
+# player actions and subsystems timed in the Tk games (missing names are skipped)
+GAME_METHODS = (
+    "cut_tree", "sell_tree", "burn_tree", "sell_all_logs", "craft_furniture", "go_to_jail",
+    "end_day", "save_game", "load_from_state", "load_from_dict", "load_game_if_exists", "get_state",
+    "update_stats", "pay_worker_salaries", "workers_produce", "apply_property_tax",
+    "fluctuate_market", "randomize_market_prices", "perform_police_inspection", "check_inspection_event",
+    "open_home", "open_market", "open_market_window", "open_hazard_menu", "open_event_log",
+    "open_workers_menu", "open_backups_list", "open_taxes_info", "run_workshop",
+)
+FOREST_METHODS = ("advance_day", "fire", "harvest", "remove_random", "to_dict")
+DIALOGS = ("showinfo", "showwarning", "showerror", "askyesno")
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def observe(self, us):
+        self.counts[bisect_left(BUCKETS_US, us)] += 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def quantile(self, q):
+        """Górna granica przedziału, w którym leży kwantyl `q` (w us, najwyżej max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(BUCKETS_US[i], self.max_us) if i < len(BUCKETS_US) else self.max_us
+        return self.max_us
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum_us": round(self.total_us, 1),
+            "max_us": round(self.max_us, 1),
+            "p50_us": self.quantile(0.5),
+            "p99_us": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in BUCKETS_US] + ["+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+    def __init__(self, enabled=False, path=None):
+        self.enabled = enabled
+        self.path = path
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, us):
+        h = self.histograms.get(name)
+        if h is None:
+            h = self.histograms[name] = Histogram()
+        h.observe(us)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+
+    # ---------------- instrumentation ----------------
+    def timed(self, name, func):
+        clock = time.perf_counter_ns
+        observe = self.observe
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, (clock() - start) / 1000.0)
+        wrapper.__wrapped_by_metrics__ = True
+        return wrapper
+
+    def wrap_methods(self, cls, names, prefix=""):
+        for name in names:
+            func = cls.__dict__.get(name)
+            if func is None or not callable(func) or getattr(func, "__wrapped_by_metrics__", False):
+                continue
+            setattr(cls, name, self.timed(prefix + name, func))
+
+    def counting_module(self, module, names, counter):
+        """Kopia modułu (np. messagebox), której wybrane funkcje zwiększają licznik."""
+        proxy = types.ModuleType(module.__name__)
+        for name in dir(module):
+            if not name.startswith("__"):
+                setattr(proxy, name, getattr(module, name))
+        for name in names:
+            func = getattr(module, name, None)
+            if func is None:
+                continue
+            def counted(*args, _func=func, **kwargs):
+                self.count(counter)
+                return _func(*args, **kwargs)
+            setattr(proxy, name, counted)
+        return proxy
+
+    # ---------------- export ----------------
+    def snapshot(self):
+        return {
+            "time": datetime.utcnow().isoformat(),
+            "counters": dict(self.counters),
+            "histograms": {k: h.to_dict() for k, h in sorted(self.histograms.items())},
+        }
+
+    def prometheus_text(self):
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric = f"las_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        if self.histograms:
+            lines.append("# TYPE las_operation_seconds histogram")
+        for name, h in sorted(self.histograms.items()):
+            seen = 0
+            for bound, c in zip(list(BUCKETS_US) + [None], h.counts):
+                seen += c
+                le = "+Inf" if bound is None else repr(bound / 1e6)
+                lines.append(f'las_operation_seconds_bucket{{op="{name}",le="{le}"}} {seen}')
+            lines.append(f'las_operation_seconds_sum{{op="{name}"}} {h.total_us / 1e6:.6f}')
+            lines.append(f'las_operation_seconds_count{{op="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Zrzut do pliku: .prom -> format Prometheusa (nadpisuje), inaczej dopisuje linię JSON."""
+        path = path or self.path
+        if not path:
+            return None
+        if path.endswith(".prom"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+        return path
+
+    def report_lines(self):
+        rows = [f"{'operacja':32s} {'ile':>7s} {'śr. ms':>9s} {'p50 ms':>8s} {'p99 ms':>8s} {'max ms':>9s}"]
+        for name, h in sorted(self.histograms.items(), key=lambda kv: -kv[1].total_us):
+            avg = h.total_us / h.count / 1000 if h.count else 0.0
+            rows.append(f"{name:32s} {h.count:7d} {avg:9.3f} {h.quantile(0.5)/1000:8.2f} "
+                        f"{h.quantile(0.99)/1000:8.2f} {h.max_us/1000:9.2f}")
+        rows.append("")
+        for name, value in sorted(self.counters.items()):
+            rows.append(f"{name:32s} {value}")
+        return rows
+
+
+def _metric_name(name):
+    return "".join(ch if ch.isalnum() else "_" for ch in name.lower())
+
+
+def from_env():
+    value = os.environ.get(ENV_VAR, "").strip()
+    if value in ("", "0"):
+        return Metrics(enabled=False)
+    return Metrics(enabled=True, path=None if value == "1" else value)
+
+
+def install(namespace, metrics=None):
+    """Włącz pomiary w grze (`globals()` modułu drzewo.py / kod), jeśli pozwala na to zmienna środowiskowa.
+
+    Zwraca obiekt `Metrics` (wyłączony, gdy pomiary są wyłączone)."""
+    metrics = metrics or from_env()
+    if not metrics.enabled:
+        return metrics
+    metrics.wrap_methods(namespace["TycoonGame"], GAME_METHODS)
+    if "Forest" in namespace:
+        metrics.wrap_methods(namespace["Forest"], FOREST_METHODS, prefix="forest.")
+    if "messagebox" in namespace:
+        namespace["messagebox"] = metrics.counting_module(namespace["messagebox"], DIALOGS, "dialogs")
+    if metrics.path:
+        atexit.register(metrics.dump)
+    return metrics
+
+
+def open_metrics_window(master, metrics, tk):
+    """Okno z tabelą histogramów i licznikami; `tk` to moduł tkinter gry."""
+    w = tk.Toplevel(master)
+    w.title("Pomiary")
+    w.geometry("720x480")
+    text = tk.Text(w, wrap=tk.NONE, font=("Courier", 10))
+    text.pack(expand=True, fill=tk.BOTH)
+
+    def refresh():
+        text.config(state=tk.NORMAL)
+        text.delete("1.0", tk.END)
+        text.insert(tk.END, "\n".join(metrics.report_lines()))
+        text.config(state=tk.DISABLED)
+
+    def dump(ext):
+        path = metrics.path if metrics.path and metrics.path.endswith(ext) else f"pomiary{ext}"
+        metrics.dump(path)
+        status.config(text=f"Zapisano {path}")
+
+    def reset():
+        metrics.reset()
+        refresh()
+
+    buttons = tk.Frame(w)
+    buttons.pack(pady=4)
+    tk.Button(buttons, text="Odśwież", command=refresh).pack(side=tk.LEFT, padx=3)
+    tk.Button(buttons, text="Zrzut JSONL", command=lambda: dump(".jsonl")).pack(side=tk.LEFT, padx=3)
+    tk.Button(buttons, text="Zrzut Prometheus", command=lambda: dump(".prom")).pack(side=tk.LEFT, padx=3)
+    tk.Button(buttons, text="Wyzeruj", command=reset).pack(side=tk.LEFT, padx=3)
+    status = tk.Label(w, text="")
+    status.pack()
+    refresh()
+    return w
@@ -0,0 +1,219 @@
+"""Rejestr pożyczek: wiele pożyczek naraz, raty annuitetowe i dzienne odsetki.
+
+Przy zaciągnięciu pożyczki liczymy cały harmonogram rat i dopisujemy go do
+zbiorczych tablic {dzień: kwota}. Dzienne rozliczenie to wtedy jedno `pop`
+z każdej tablicy - O(1) niezależnie od liczby pożyczek. Koszt O(okres) płacimy
+tylko raz, przy otwarciu lub nadpłacie pożyczki.
+"""
+import heapq
+import math
+
+DEFAULT_LOAN_TERM_DAYS = 30   # standardowy okres, do którego odnosi się LOAN_INTEREST_RATE
+LOAN_TERMS = (7, 30, 90)      # okresy do wyboru w oknie pożyczki
+
+
+def annuity_payment(balance, rate, days):
+    """Stała rata dzienna spłacająca `balance` w `days` dni przy stopie dziennej `rate`."""
+    if days <= 0:
+        return balance
+    if rate == 0:
+        return balance / days
+    return balance * rate / (1.0 - (1.0 + rate) ** -days)
+
+
+def daily_rate_for(total_rate, term=DEFAULT_LOAN_TERM_DAYS):
+    """Stopa dzienna, przy której raty za `term` dni kosztują razem `total_rate` ponad kapitał.
+
+    Odsetki annuitetu liczone są od malejącego salda, więc nie wystarczy podzielić
+    `total_rate` przez liczbę dni - szukamy stopy bisekcją."""
+    if total_rate <= 0 or term <= 0:
+        return 0.0
+    lo, hi = 0.0, total_rate  # at rate == total_rate the first day's interest alone is total_rate
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if annuity_payment(1.0, mid, term) * term - 1.0 < total_rate:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def build_schedule(balance, rate, days):
+    """Harmonogram: lista (rata, odsetki, kapitał) w pełnych złotówkach."""
+    payment = int(math.ceil(annuity_payment(balance, rate, days)))
+    rows = []
+    left = int(balance)
+    for n in range(days):
+        interest = int(round(left * rate))
+        if n == days - 1 or payment - interest >= left:
+            rows.append((left + interest, interest, left))
+            break
+        rows.append((payment, interest, payment - interest))
+        left -= payment - interest
+    return rows
+
+
+class Loan:
+    __slots__ = ("loan_id", "principal", "rate", "start_day", "schedule", "first_day")
+
+    def __init__(self, loan_id, principal, rate, start_day, schedule, first_day):
+        self.loan_id = loan_id
+        self.principal = principal
+        self.rate = rate
+        self.start_day = start_day
+        self.schedule = schedule    # rows from build_schedule
+        self.first_day = first_day  # day on which schedule[0] is due
+
+    @property
+    def end_day(self):
+        return self.first_day + len(self.schedule) - 1
+
+    def balance_on(self, day):
+        """Kapitał do spłaty po rozliczeniu dnia `day`."""
+        paid = sum(row[2] for row in self.schedule[:max(0, day - self.first_day + 1)])
+        return sum(row[2] for row in self.schedule) - paid
+
+    def payment_on(self, day):
+        idx = day - self.first_day
+        return self.schedule[idx][0] if 0 <= idx < len(self.schedule) else 0
+
+
+class LoanLedger:
+    def __init__(self):
+        self.loans = {}
+        self.next_id = 1
+        self.day = 0
+        self.outstanding = 0          # kapitał wszystkich pożyczek
+        self.interest_paid = 0
+        self._due = {}                # dzień -> suma rat
+        self._interest = {}           # dzień -> suma odsetek w ratach
+        self._principal = {}          # dzień -> suma kapitału w ratach
+        self._ends = []               # heap (ostatni dzień, id)
+
+    def _book(self, loan, sign):
+        for n, (payment, interest, principal) in enumerate(loan.schedule):
+            d = loan.first_day + n
+            if d <= self.day:
+                continue
+            self._due[d] = self._due.get(d, 0) + sign * payment
+            self._interest[d] = self._interest.get(d, 0) + sign * interest
+            self._principal[d] = self._principal.get(d, 0) + sign * principal
+            self.outstanding += sign * principal
+
+    # ---------------- loans ----------------
+    def open_loan(self, amount, day, term=DEFAULT_LOAN_TERM_DAYS, rate=0.0):
+        """Zaciągnij pożyczkę w dniu `day`; raty od następnego dnia przez `term` dni."""
+        self.day = max(self.day, day)
+        loan = Loan(self.next_id, amount, rate, day, build_schedule(amount, rate, term), day + 1)
+        self.next_id += 1
+        self.loans[loan.loan_id] = loan
+        self._book(loan, +1)
+        heapq.heappush(self._ends, (loan.end_day, loan.loan_id))
+        return loan
+
+    def due_on(self, day):
+        return self._due.get(day, 0)
+
+    def daily_payment(self):
+        """Suma rat na najbliższy dzień."""
+        return self._due.get(self.day + 1, 0)
+
+    def process_day(self, day, available):
+        """Rozlicz ratę dnia `day` z kwoty `available`. Zwraca (zapłacono, niezapłacono).
+
+        Niezapłacona część raty przechodzi na gracza jako dług (komornik), a
+        harmonogram biegnie dalej - pożyczka jest w tym sensie spłacona długiem."""
+        self.day = day
+        due = self._due.pop(day, 0)
+        self.interest_paid += self._interest.pop(day, 0)
+        self.outstanding -= self._principal.pop(day, 0)
+        while self._ends and self._ends[0][0] <= day:
+            _, loan_id = heapq.heappop(self._ends)
+            loan = self.loans.get(loan_id)
+            if loan is not None and loan.end_day <= day:
+                del self.loans[loan_id]
+        paid = min(due, max(0, available))
+        return paid, due - paid
+
+    def priority(self):
+        """Kolejność nadpłat: najpierw najdroższe pożyczki, potem największe saldo."""
+        return sorted(self.loans.values(), key=lambda l: (-l.rate, -l.balance_on(self.day)))
+
+    def prepay(self, amount):
+        """Nadpłata: spłaca kapitał pożyczek w kolejności `priority()`, skracając
+        harmonogram (rata zostaje, okres się skraca). Zwraca wykorzystaną kwotę."""
+        used = 0
+        for loan in self.priority():
+            if amount - used <= 0:
+                break
+            balance = loan.balance_on(self.day)
+            pay = min(balance, amount - used)
+            used += pay
+            self._book(loan, -1)
+            left = balance - pay
+            if left <= 0:
+                del self.loans[loan.loan_id]
+                continue
+            payment = loan.payment_on(self.day + 1) or loan.schedule[-1][0]
+            # shortest term that keeps the current installment
+            days = 1
+            while annuity_payment(left, loan.rate, days) > payment and days < 10000:
+                days += 1
+            loan.schedule = build_schedule(left, loan.rate, days)
+            loan.first_day = self.day + 1
+            self._book(loan, +1)
+            heapq.heappush(self._ends, (loan.end_day, loan.loan_id))
+        return used
+
+    # ---------------- projection ----------------
+    def project(self, plan, horizon=3650):
+        """Krzywa spłaty dla planu wpłat: `plan` to stała dzienna wpłata albo lista
+        wpłat na kolejne dni. Wpłaty trafiają do pożyczek wg `priority()`.
+
+        Zwraca listę łącznego salda po każdym dniu (do spłaty lub `horizon`)."""
+        loans = self.priority()
+        balances = [float(l.balance_on(self.day)) for l in loans]
+        rates = [l.rate for l in loans]
+        curve = []
+        for t in range(horizon):
+            if sum(balances) <= 0.5:
+                break
+            pay = plan[t] if isinstance(plan, (list, tuple)) else plan
+            if isinstance(plan, (list, tuple)) and t >= len(plan):
+                pay = 0
+            for i in range(len(balances)):
+                balances[i] *= 1.0 + rates[i]
+            for i in range(len(balances)):
+                if pay <= 0:
+                    break
+                take = min(balances[i], pay)
+                balances[i] -= take
+                pay -= take
+            curve.append(int(round(sum(balances))))
+        return curve
+
+    # ---------------- save / load ----------------
+    def to_dict(self):
+        return {
+            "day": self.day,
+            "next_id": self.next_id,
+            "interest_paid": self.interest_paid,
+            "loans": [{"id": l.loan_id, "principal": l.principal, "rate": l.rate,
+                       "start_day": l.start_day, "balance": l.balance_on(self.day),
+                       "end_day": l.end_day} for l in self.loans.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        ledger = cls()
+        ledger.day = data.get("day", 0)
+        ledger.next_id = data.get("next_id", 1)
+        ledger.interest_paid = data.get("interest_paid", 0)
+        for ld in data.get("loans", []):
+            days = max(1, ld["end_day"] - ledger.day)
+            loan = Loan(ld["id"], ld["principal"], ld["rate"], ld["start_day"],
+                        build_schedule(ld["balance"], ld["rate"], days), ledger.day + 1)
+            ledger.loans[loan.loan_id] = loan
+            ledger._book(loan, +1)
+            heapq.heappush(ledger._ends, (loan.end_day, loan.loan_id))
+        return ledger
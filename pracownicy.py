@@ -0,0 +1,214 @@
+"""Pracownicy: tablica pracowników i dzienna produkcja drewna.
+
+Zamiast listy obiektów `Worker` trzymamy kolumny w `array` (typ, poziom,
+przydział do gatunku, pensja). Produkcja i pensje liczone są z sum
+utrzymywanych przy zatrudnianiu/zwalnianiu, więc dzień kosztuje O(gatunki),
+a nie O(pracownicy).
+"""
+import math
+import random
+from array import array
+
+ANY_SPECIES = -1          # pracownik bez przydziału - produkcja losowana między gatunki
+MAX_SKILL = 3
+SKILL_SALARY_STEP = 0.25  # każdy poziom powyżej 1 to +25% pensji
+FATIGUE_PER_DAY = 0.03    # zmęczenie ekipy rośnie z każdym dniem pracy bez odpoczynku
+MAX_FATIGUE = 0.5         # zmęczenie obniża produkcję najwyżej o połowę
+
+
+class Worker:
+    """Typ pracownika (szablon do zatrudnienia)."""
+    __slots__ = ("name", "salary", "bonus")
+
+    def __init__(self, name, salary, bonus_logs_per_day):
+        self.name = name
+        self.salary = salary
+        self.bonus = bonus_logs_per_day
+
+    def to_dict(self):
+        return {"name": self.name, "salary": self.salary, "bonus": self.bonus}
+
+    @staticmethod
+    def from_dict(d):
+        return Worker(d["name"], d["salary"], d["bonus"])
+
+
+WORKER_TYPES = [
+    Worker("Leśniczy", 20, 1),
+    Worker("Ogrodnik", 40, 2),
+    Worker("Ekspert od świerku", 70, 3),
+]
+
+
+def binomial(n, p, rng=random):
+    """Losowanie z rozkładu dwumianowego; dla dużych n przybliżenie normalne."""
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if n < 50:
+        return sum(1 for _ in range(n) if rng.random() < p)
+    mean = n * p
+    k = int(round(rng.gauss(mean, math.sqrt(mean * (1.0 - p)))))
+    return min(n, max(0, k))
+
+
+def multinomial(n, weights, rng=random):
+    """Rozdziel `n` jednostek między kategorie wg wag (kolejne warunkowe dwumiany)."""
+    out = [0] * len(weights)
+    left_w = float(sum(weights))
+    for i, w in enumerate(weights):
+        if n <= 0 or left_w <= 0:
+            break
+        k = n if i == len(weights) - 1 else binomial(n, w / left_w, rng)
+        out[i] = k
+        n -= k
+        left_w -= w
+    return out
+
+
+class WorkforceTable:
+    __slots__ = ("types", "n_species", "type_ids", "skills", "assigned", "salaries",
+                 "total_salary", "type_counts", "species_output", "pool_output", "fatigue", "resting", "carry")
+
+    def __init__(self, n_species, types=WORKER_TYPES):
+        self.types = list(types)
+        self.n_species = n_species
+        self.type_ids = array("b")
+        self.skills = array("b")
+        self.assigned = array("i")  # species id; mods may register hundreds of species
+        self.salaries = array("l")
+        self.total_salary = 0
+        self.type_counts = [0] * len(self.types)
+        # logs/day of workers bound to a species, and of the unassigned pool
+        self.species_output = [0] * n_species
+        self.pool_output = 0
+        self.fatigue = 0.0
+        self.resting = False
+        self.carry = 0.0  # fraction of a log the team has cut but not finished yet
+
+    def __len__(self):
+        return len(self.type_ids)
+
+    def output_of(self, type_id, skill):
+        return self.types[type_id].bonus + (skill - 1)
+
+    def _account(self, idx, sign):
+        out = sign * self.output_of(self.type_ids[idx], self.skills[idx])
+        sid = self.assigned[idx]
+        if sid == ANY_SPECIES:
+            self.pool_output += out
+        else:
+            self.species_output[sid] += out
+        self.total_salary += sign * self.salaries[idx]
+        self.type_counts[self.type_ids[idx]] += sign
+
+    # ---------------- roster ----------------
+    def hire(self, type_id, skill=1, species=ANY_SPECIES):
+        skill = min(MAX_SKILL, max(1, skill))
+        salary = int(round(self.types[type_id].salary * (1 + SKILL_SALARY_STEP * (skill - 1))))
+        self.type_ids.append(type_id)
+        self.skills.append(skill)
+        self.assigned.append(species)
+        self.salaries.append(salary)
+        self._account(len(self.type_ids) - 1, +1)
+        return len(self.type_ids) - 1
+
+    def fire(self, idx):
+        """Zwolnij pracownika (ostatni wskakuje na jego miejsce)."""
+        self._account(idx, -1)
+        last = len(self.type_ids) - 1
+        for col in (self.type_ids, self.skills, self.assigned, self.salaries):
+            col[idx] = col[last]
+            col.pop()
+        if not self.type_ids:
+            self.fatigue = 0.0  # the next team starts fresh
+            self.carry = 0.0
+
+    def clear(self):
+        self.__init__(self.n_species, self.types)
+
+    def assign(self, idx, species):
+        self._account(idx, -1)
+        self.assigned[idx] = species
+        self._account(idx, +1)
+
+    def promote(self, idx):
+        if self.skills[idx] >= MAX_SKILL:
+            return False
+        self._account(idx, -1)
+        self.skills[idx] += 1
+        base = self.types[self.type_ids[idx]].salary
+        self.salaries[idx] = int(round(base * (1 + SKILL_SALARY_STEP * (self.skills[idx] - 1))))
+        self._account(idx, +1)
+        return True
+
+    def describe(self, idx, species_names):
+        t = self.types[self.type_ids[idx]]
+        sid = self.assigned[idx]
+        where = species_names[sid] if sid != ANY_SPECIES else "dowolne"
+        return (f"{t.name} (poz. {self.skills[idx]}) - pensja {self.salaries[idx]} zł/dzień - "
+                f"+{self.output_of(self.type_ids[idx], self.skills[idx])}/d - przydział: {where}")
+
+    def summary(self):
+        parts = [f"{t.name} x{n}" for t, n in zip(self.types, self.type_counts) if n]
+        return " | ".join(parts) if parts else "brak"
+
+    # ---------------- daily processing ----------------
+    def rest(self):
+        """Zaplanuj dzień wolny: jutro ekipa nic nie wytnie, ale zmęczenie spadnie do zera."""
+        self.resting = True
+
+    def produce(self, rng=random):
+        """Produkcja całej ekipy na dziś: lista drewna per gatunek."""
+        if self.resting:
+            self.resting = False
+            self.fatigue = 0.0
+            return [0] * self.n_species
+        full = self.pool_output + sum(self.species_output)
+        if full <= 0:
+            return [0] * self.n_species  # nobody works, nobody gets tired
+        # fatigue applies to the whole team once; the fraction carries over to the next day
+        factor = 1.0 - self.fatigue
+        self.fatigue = min(MAX_FATIGUE, self.fatigue + FATIGUE_PER_DAY)
+        effective = full * factor + self.carry
+        total = int(effective)
+        self.carry = effective - total
+        # split the team total by output shares (largest remainder); the pool is the last share
+        shares = [out * total / full for out in self.species_output] + [self.pool_output * total / full]
+        split = [int(x) for x in shares]
+        for i in sorted(range(len(shares)), key=lambda i: shares[i] - split[i], reverse=True)[:total - sum(split)]:
+            split[i] += 1
+        produced = split[:-1]
+        pool = split[-1]
+        if pool > 0:
+            for sid, k in enumerate(multinomial(pool, [1] * self.n_species, rng)):
+                produced[sid] += k
+        return produced
+
+    # ---------------- save / load ----------------
+    def to_dict(self):
+        return {
+            "fatigue": self.fatigue,
+            "resting": self.resting,
+            "carry": self.carry,
+            "workers": [[self.type_ids[i], self.skills[i], self.assigned[i]] for i in range(len(self))],
+        }
+
+    @classmethod
+    def from_state(cls, n_species, data, types=WORKER_TYPES):
+        table = cls(n_species, types)
+        if isinstance(data, list):
+            # old saves: list of Worker.to_dict()
+            by_name = {t.name: i for i, t in enumerate(table.types)}
+            for wd in data:
+                if wd.get("name") in by_name:
+                    table.hire(by_name[wd["name"]])
+            return table
+        table.fatigue = data.get("fatigue", 0.0)
+        table.resting = data.get("resting", False)
+        table.carry = data.get("carry", 0.0)
+        for type_id, skill, species in data.get("workers", []):
+            if 0 <= type_id < len(table.types):
+                table.hire(type_id, skill, species if species < n_species else ANY_SPECIES)
+        return table
@@ -0,0 +1,132 @@
+"""Ryzyko i ubezpieczenie lasu: rozkłady strat, składka i likwidacja szkód.
+
+Reguły gry (kod, end_day) dają dwa źródła strat drzew w ciągu dnia:
+  * pożar - z szansą `fire_chance`, strata jednostajna 1..max(1, N // 4),
+  * inspekcja policji - z szansą `inspection_chance`, konfiskata 1..min(3, N),
+gdzie N to liczba drzew. Z tych reguł liczymy dokładne rozkłady strat (w drzewach)
+i to, co z nich pokrywa polisa (`effectiveness` straty). Składka dzienna to
+cena uczciwa (wartość oczekiwana pokrytej straty) plus narzut: procentowy na
+koszty i ryzyko (RISK_LOADING odchyleń standardowych).
+
+Rozkłady zależą tylko od wielkości lasu, więc liczymy je raz na przedział
+wielkości (4 przedziały na każde podwojenie lasu, liczone dla górnej granicy
+przedziału) i trzymamy w pamięci; wycena to potem mnożenie przez wartość drzewa.
+Likwidacja szkody po pożarze to podział proporcjonalny per gatunek - O(gatunki),
+a nie losowanie drzewo po drzewie.
+"""
+import math
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import accumulate
+
+EXPENSE_LOADING = 0.25   # narzut ubezpieczyciela na koszty (25% ceny uczciwej)
+RISK_LOADING = 0.05      # narzut za ryzyko: tyle odchyleń standardowych pokrytej straty
+SUB_BUCKETS = 4          # przedziały wielkości lasu na każde podwojenie
+
+Quote = namedtuple("Quote", "daily fair loading expected_loss worst_loss tree_value")
+
+
+def size_bucket(n):
+    """(przedział, jego górna granica) dla lasu z `n` drzewami."""
+    if n <= 2 * SUB_BUCKETS:
+        return n, n
+    shift = n.bit_length() - 3  # keep the 3 leading bits: 4 sub-buckets per octave
+    top = n >> shift
+    return (shift, top), ((top + 1) << shift) - 1
+
+
+def uniform_loss(chance, max_loss):
+    """Rozkład straty: 0 z prawdopodobieństwem 1-chance, inaczej jednostajnie 1..max_loss."""
+    if max_loss <= 0 or chance <= 0:
+        return [1.0]
+    p = chance / max_loss
+    return [1.0 - chance] + [p] * max_loss
+
+
+def _moments(pmf, f=lambda k: k):
+    mean = sum(p * f(k) for k, p in enumerate(pmf))
+    var = sum(p * (f(k) - mean) ** 2 for k, p in enumerate(pmf))
+    return mean, var
+
+
+class _SumCDF:
+    """Dystrybuanta sumy dwóch niezależnych strat; druga ma mały nośnik (inspekcja: 0..3)."""
+
+    def __init__(self, big, small):
+        self.cum = list(accumulate(big))
+        self.small = small
+
+    def __len__(self):
+        return len(self.cum) + len(self.small) - 1
+
+    def __getitem__(self, x):
+        last = len(self.cum) - 1
+        return sum(p * self.cum[min(x - j, last)] for j, p in enumerate(self.small) if x >= j)
+
+
+class RiskProfile:
+    """Rozkłady strat (w drzewach) dla jednego przedziału wielkości lasu."""
+    __slots__ = ("trees", "fire", "inspection", "covered_mean", "covered_var", "expected_loss", "worst_loss")
+
+    def __init__(self, trees, fire_chance, inspection_chance, effectiveness):
+        self.trees = trees
+        self.fire = uniform_loss(fire_chance, max(1, trees // 4) if trees else 0)
+        self.inspection = uniform_loss(inspection_chance, min(3, trees))
+        # a fire claim restores int(loss * effectiveness) trees, an inspection claim pays for that share
+        fire_mean, fire_var = _moments(self.fire, lambda k: int(k * effectiveness))
+        insp_mean, insp_var = _moments(self.inspection, lambda k: k * effectiveness)
+        self.covered_mean = fire_mean + insp_mean
+        self.covered_var = fire_var + insp_var
+        self.expected_loss = _moments(self.fire)[0] + _moments(self.inspection)[0]
+        # 99% quantile of the total loss without materialising the convolution
+        self.worst_loss = bisect_left(_SumCDF(self.fire, self.inspection), 0.99 - 1e-12)
+
+
+class RiskEngine:
+    def __init__(self):
+        self._profiles = {}
+        self.recomputed = 0
+
+    def profile(self, trees, fire_chance, inspection_chance, effectiveness):
+        bucket, top = size_bucket(trees)
+        key = (bucket, fire_chance, inspection_chance, effectiveness)
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = RiskProfile(top, fire_chance, inspection_chance, effectiveness)
+            self.recomputed += 1
+        return profile
+
+    def quote(self, trees, tree_value, fire_chance, inspection_chance, effectiveness, minimum=0):
+        """Składka dzienna (zł) za polisę na las z `trees` drzewami wartymi `tree_value` zł/szt."""
+        profile = self.profile(trees, fire_chance, inspection_chance, effectiveness)
+        fair = profile.covered_mean * tree_value
+        loading = EXPENSE_LOADING * fair + RISK_LOADING * math.sqrt(profile.covered_var) * tree_value
+        daily = max(minimum, int(math.ceil(fair + loading)))
+        return Quote(daily, round(fair, 2), round(loading, 2), round(profile.expected_loss * tree_value, 2),
+                     int(profile.worst_loss * tree_value), round(tree_value, 2))
+
+
+def tree_value(counts, prices):
+    """Średnia wartość drzewa (zł): ceny gatunków ważone licznością."""
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    return sum(n * prices.get(name, 0) for name, n in counts.items()) / total
+
+
+def settle_fire(lost, effectiveness):
+    """Drzewa przywracane przez polisę po pożarze: {gatunek: ile}, proporcjonalnie do strat.
+
+    Resztę z zaokrągleń dostają gatunki o największej części ułamkowej."""
+    target = int(sum(lost.values()) * effectiveness)
+    shares = {s: n * effectiveness for s, n in lost.items() if n > 0}
+    restored = {s: int(v) for s, v in shares.items()}
+    left = target - sum(restored.values())
+    for s in sorted(shares, key=lambda s: shares[s] - restored[s], reverse=True)[:max(0, left)]:
+        restored[s] += 1
+    return {s: n for s, n in restored.items() if n}
+
+
+def settle_inspection(confiscated, value, effectiveness):
+    """Odszkodowanie (zł) za skonfiskowane drzewa."""
+    return int(confiscated * value * effectiveness)
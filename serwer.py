@@ -0,0 +1,398 @@
+"""Wspólny rynek drewna dla wielu graczy: serwer asyncio na localhost.
+
+    python serwer.py                               # 127.0.0.1:8765, tick 100 ms, dzień = 600 ticków
+    LAS_SERWER=127.0.0.1:8765 python drzewo.py     # gra podłączona do wspólnego rynku
+    python benchmarks/rynek.py --clients 300       # test obciążenia (boty bez okna)
+
+Protokół: jedna linia JSON na wiadomość (TCP). Klient wysyła `hello`, potem
+zlecenia `sell` (indeks gatunku, ilość). Serwer nie rozlicza zleceń od razu:
+zbiera je przez cały tick, sumuje per gatunek i rozlicza wszystkie jedną ceną -
+cena spada proporcjonalnie do sprzedanej w ticku ilości, a potem z każdym tickiem
+wraca do ceny dnia. Po ticku wszyscy klienci dostają tę samą linię `tick` z samymi
+zmianami cen (delty w zł, tylko zmienione gatunki; pełne ceny są w `welcome`),
+a ci, którzy coś sprzedali, dodatkowo linię `fill`. Co `ticks_per_day` ticków
+zaczyna się nowy dzień (wspólny zegar) i ceny dnia są losowane od nowa.
+
+Linię `tick` kodujemy raz dla wszystkich klientów. Klient, który nie nadąża
+czytać (bufor zapisu > MAX_CLIENT_BUFFER), jest rozłączany, zamiast spowalniać resztę.
+"""
+import argparse
+import asyncio
+import json
+import queue
+import random
+import threading
+import time
+
+import pomiary
+import zawartosc
+
+HOST = "127.0.0.1"
+PORT = 8765
+TICK_MS = 100
+TICKS_PER_DAY = 600          # 60 s na dzień przy domyślnym ticku
+BACKLOG = 1024               # setki botów łączą się naraz
+
+# the same market as drzewo.py (species from the content registry, MARKET_VOLATILITY)
+BASE_PRICES = zawartosc.load().price_table()
+MARKET_VOLATILITY = 0.20
+PRICE_IMPACT = 0.002         # spadek ceny na każde drewno sprzedane w ticku (0.2%)
+MAX_TICK_DROP = 0.5          # w jednym ticku cena spada najwyżej o połowę
+PRICE_RECOVERY = 0.05        # część odchylenia od ceny dnia odrabiana w każdym ticku
+MAX_ORDER = 10_000
+MAX_CLIENT_BUFFER = 256 * 1024
+
+
+def encode(msg):
+    return (json.dumps(msg, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def parse_address(address):
+    host, _, port = (address or "").rpartition(":")
+    return host or HOST, int(port or PORT)
+
+
+class Market:
+    """Ceny dnia i rozliczanie zleceń zebranych w jednym ticku."""
+
+    def __init__(self, base_prices=None, volatility=MARKET_VOLATILITY, impact=PRICE_IMPACT,
+                 recovery=PRICE_RECOVERY, rng=None):
+        base_prices = base_prices or BASE_PRICES
+        self.species = list(base_prices)
+        self.base = [base_prices[s] for s in self.species]
+        self.volatility = volatility
+        self.impact = impact
+        self.recovery = recovery
+        self.rng = rng or random.Random()
+        self.orders = []   # (client id, order id, species index, qty) of the current tick
+        self.volume = [0] * len(self.species)
+        self.new_day()
+
+    def new_day(self):
+        # jak drzewo.py randomize_market_prices
+        self.day_prices = [max(1, int(round(b * (1 + self.rng.uniform(-self.volatility, self.volatility)))))
+                           for b in self.base]
+        self.prices = [float(p) for p in self.day_prices]
+
+    def submit(self, client_id, order_id, i, qty):
+        self.orders.append((client_id, order_id, i, qty))
+        self.volume[i] += qty
+
+    def quotes(self):
+        return [max(1, int(round(p))) for p in self.prices]
+
+    def clear(self):
+        """Rozlicz tick: jedna cena na gatunek. Zwraca {klient: [[id zlecenia, ilość, cena], ...]}."""
+        for i, volume in enumerate(self.volume):
+            p = self.prices[i] + (self.day_prices[i] - self.prices[i]) * self.recovery
+            if volume:
+                p *= max(1 - MAX_TICK_DROP, 1 - self.impact * volume)
+            self.prices[i] = max(1.0, p)
+        if not self.orders:
+            return {}
+        clearing = self.quotes()
+        fills = {}
+        for client_id, order_id, i, qty in self.orders:
+            fills.setdefault(client_id, []).append([order_id, qty, clearing[i]])
+        self.orders = []
+        self.volume = [0] * len(self.species)
+        return fills
+
+
+class _Client:
+    __slots__ = ("id", "name", "writer")
+
+    def __init__(self, client_id, name, writer):
+        self.id = client_id
+        self.name = name
+        self.writer = writer
+
+
+class MarketServer:
+    def __init__(self, host=HOST, port=PORT, tick_ms=TICK_MS, ticks_per_day=TICKS_PER_DAY, seed=None, market=None):
+        self.host = host
+        self.port = port
+        self.tick_ms = tick_ms
+        self.ticks_per_day = ticks_per_day
+        self.market = market or Market(rng=random.Random(seed))
+        self.clients = {}
+        self.tick = 0
+        self.day = 1
+        self.dropped = 0
+        self.metrics = pomiary.Metrics(enabled=True)
+        self._sent = self.market.quotes()  # prices as last broadcast (base of the deltas)
+        self._next_id = 1
+        self._server = None
+        self._clock = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=BACKLOG)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._clock = asyncio.create_task(self._run_clock())
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._clock
+
+    async def stop(self):
+        self._clock.cancel()
+        self._server.close()
+        for client in list(self.clients.values()):
+            client.writer.close()
+        await self._server.wait_closed()
+
+    # ---------------- connections ----------------
+    async def _handle(self, reader, writer):
+        client = None
+        try:
+            async for line in reader:
+                msg = json.loads(line)
+                if not isinstance(msg, dict):
+                    writer.write(encode({"op": "error", "text": "Wiadomość musi być obiektem JSON."}))
+                    continue
+                op = msg.get("op")
+                if op == "sell" and client is not None:
+                    self._order(client, msg)
+                elif op == "hello" and client is None:
+                    client = _Client(self._next_id, str(msg.get("name", ""))[:40], writer)
+                    self._next_id += 1
+                    self.clients[client.id] = client
+                    writer.write(encode({"op": "welcome", "client": client.id, "species": self.market.species,
+                                         "prices": self._sent, "day": self.day, "tick": self.tick,
+                                         "tick_ms": self.tick_ms, "ticks_per_day": self.ticks_per_day}))
+                elif op == "stats":
+                    writer.write(encode({"op": "stats", **self.stats()}))
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if client is not None:
+                self.clients.pop(client.id, None)
+            writer.close()
+
+    def _order(self, client, msg):
+        i, qty = msg.get("s"), msg.get("n")
+        if not (isinstance(i, int) and 0 <= i < len(self.market.species)
+                and isinstance(qty, int) and 0 < qty <= MAX_ORDER):
+            client.writer.write(encode({"op": "error", "id": msg.get("id"), "text": "Niepoprawne zlecenie."}))
+            return
+        self.market.submit(client.id, msg.get("id"), i, qty)
+        self.metrics.count("orders")
+        self.metrics.count("volume", qty)
+
+    def _send(self, client, data):
+        transport = client.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            self.dropped += 1
+            transport.abort()  # the handler's finally drops the client
+            return
+        client.writer.write(data)
+
+    # ---------------- clock ----------------
+    async def _run_clock(self):
+        loop = asyncio.get_running_loop()
+        period = self.tick_ms / 1000
+        next_at = loop.time()
+        while True:
+            next_at += period
+            delay = next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_at = loop.time()  # late: skip the missed ticks instead of bursting
+            self.step()
+
+    def step(self):
+        """Jeden tick: rozliczenie zleceń, ewentualnie nowy dzień, rozesłanie delt cen."""
+        start = time.perf_counter_ns()
+        self.tick += 1
+        fills = self.market.clear()
+        new_day = self.tick % self.ticks_per_day == 0
+        if new_day:
+            self.day += 1
+            self.market.new_day()
+        quotes = self.market.quotes()
+        msg = {"op": "tick", "t": self.tick, "ts": time.time(),
+               "d": [[i, q - s] for i, (q, s) in enumerate(zip(quotes, self._sent)) if q != s]}
+        if new_day:
+            msg["day"] = self.day
+        self._sent = quotes
+        line = encode(msg)
+        for client in list(self.clients.values()):
+            own = fills.get(client.id)
+            self._send(client, line + encode({"op": "fill", "fills": own}) if own else line)
+        self.metrics.observe("tick", (time.perf_counter_ns() - start) / 1000.0)
+
+    def stats(self):
+        tick = self.metrics.histograms.get("tick")
+        return {"clients": len(self.clients), "tick": self.tick, "day": self.day, "dropped": self.dropped,
+                "counters": dict(self.metrics.counters), "tick_us": tick.to_dict() if tick else None}
+
+
+class MarketClient:
+    """Klient rynku (asyncio). Lokalne ceny składa z delt przysyłanych co tick.
+
+    `on_tick(msg)` i `on_fill(order_id, species_index, qty, price, sent_at)` są
+    wywoływane z pętli zdarzeń klienta."""
+
+    def __init__(self, name="gracz", on_tick=None, on_fill=None):
+        self.name = name
+        self.on_tick = on_tick
+        self.on_fill = on_fill
+        self.species = []
+        self.prices = []
+        self.day = 1
+        self.tick = 0
+        self.pending = {}  # order id -> (perf_counter at send, species index)
+        self.last_stats = None
+        self._next_order = 1
+        self._stats_ready = None
+        self.reader = self.writer = None
+
+    async def connect(self, host=HOST, port=PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode({"op": "hello", "name": self.name}))
+        welcome = json.loads(await self.reader.readline())
+        self.client_id = welcome["client"]
+        self.species = welcome["species"]
+        self.prices = list(welcome["prices"])
+        self.day = welcome["day"]
+        self.tick = welcome["tick"]
+        return self
+
+    def sell(self, i, qty):
+        order_id = self._next_order
+        self._next_order += 1
+        self.pending[order_id] = (time.perf_counter(), i)
+        self.writer.write(encode({"op": "sell", "id": order_id, "s": i, "n": qty}))
+        return order_id
+
+    async def request_stats(self):
+        self._stats_ready = asyncio.get_running_loop().create_future()
+        self.writer.write(encode({"op": "stats"}))
+        return await self._stats_ready
+
+    async def run(self):
+        async for line in self.reader:
+            self.handle(json.loads(line))
+
+    def handle(self, msg):
+        op = msg["op"]
+        if op == "tick":
+            for i, delta in msg["d"]:
+                self.prices[i] += delta
+            self.tick = msg["t"]
+            self.day = msg.get("day", self.day)
+            if self.on_tick:
+                self.on_tick(msg)
+        elif op == "fill":
+            for order_id, qty, price in msg["fills"]:
+                sent_at, i = self.pending.pop(order_id, (None, None))
+                if self.on_fill:
+                    self.on_fill(order_id, i, qty, price, sent_at)
+        elif op == "error":
+            self.pending.pop(msg.get("id"), None)
+        elif op == "stats":
+            self.last_stats = msg
+            if self._stats_ready is not None and not self._stats_ready.done():
+                self._stats_ready.set_result(msg)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class GameLink:
+    """Połączenie gry Tk z serwerem: klient asyncio w wątku w tle.
+
+    Tk nie jest bezpieczny wątkowo, więc (jak zapisy.SaveProbe) wątek tylko
+    wrzuca zdarzenia do kolejki, a gra odbiera je przez `poll()` z `after`:
+        ("welcome", ceny, dzień) / ("prices", ceny, nowy dzień albo None)
+        ("fill", gatunek, ilość, cena) / ("closed", błąd albo None)
+    """
+
+    def __init__(self, address, name="gracz"):
+        self.host, self.port = parse_address(address)
+        self.name = name
+        self.client = None
+        self.events = queue.SimpleQueue()
+        self._loop = None
+        self._thread = threading.Thread(target=self._run, name="market-link", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        error = None
+        try:
+            client = MarketClient(self.name, on_tick=self._on_tick, on_fill=self._on_fill)
+            await client.connect(self.host, self.port)
+            self.client = client
+            self.events.put(("welcome", self._prices(), client.day))
+            await client.run()
+        except Exception as e:
+            error = e
+        self.events.put(("closed", error))
+
+    def _prices(self):
+        return dict(zip(self.client.species, self.client.prices))
+
+    def _on_tick(self, msg):
+        if msg["d"] or "day" in msg:
+            self.events.put(("prices", self._prices(), msg.get("day")))
+
+    def _on_fill(self, order_id, i, qty, price, sent_at):
+        self.events.put(("fill", self.client.species[i], qty, price))
+
+    def sell(self, species, qty):
+        client = self.client
+        self._loop.call_soon_threadsafe(client.sell, client.species.index(species), qty)
+
+    def poll(self):
+        out = []
+        while True:
+            try:
+                out.append(self.events.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self):
+        if self._loop is not None and self.client is not None:
+            self._loop.call_soon_threadsafe(self.client.writer.close)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serwer wspólnego rynku drewna (localhost).")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 = wolny port (wypisywany na starcie)")
+    parser.add_argument("--tick-ms", type=int, default=TICK_MS)
+    parser.add_argument("--ticks-per-day", type=int, default=TICKS_PER_DAY)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await MarketServer(args.host, args.port, args.tick_ms, args.ticks_per_day, args.seed).start()
+        print(f"Serwer rynku: {server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
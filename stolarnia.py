@@ -0,0 +1,185 @@
+"""Stolarnia: receptury, półprodukty (deski), kolejka zleceń i moc warsztatu.
+
+Receptura (z rejestru zawartości: `zawartosc.json` -> "recipes") zamienia wejścia
+na wyjścia i wymaga `labor` jednostek pracy na sztukę. Wejściem może być drewno
+konkretnego gatunku, dowolne drewno ("*" - najpierw najtańsze gatunki) albo
+półprodukt, np. deski. Wyjście będące meblem z rejestru trafia do domu gracza,
+pozostałe (deski) do magazynu warsztatu. Receptura nie powinna łączyć "*" z
+konkretnym gatunkiem drewna.
+
+Zlecenie to [receptura, ile sztuk zostało, praca włożona w następną sztukę].
+Warsztat ma dzienną moc `capacity` jednostek pracy, rozdzielaną między zlecenia
+po kolei. Dzień liczymy na całych zleceniach: liczba sztuk to minimum z (zostało,
+ile starczy wejść, ile starczy pracy), a zużycie wejść to mnożenie - koszt dnia to
+O(zlecenia x wejścia + gatunki), niezależnie od tego, czy zlecono 1 czy 1000 krzeseł.
+"""
+
+ANY_LOG = "*"
+WORKSHOP_CAPACITY = 12    # jednostki pracy dziennie
+CAPACITY_STEP = 6         # tyle daje jedna rozbudowa warsztatu
+
+
+class Recipe:
+    __slots__ = ("name", "inputs", "outputs", "labor")
+
+    def __init__(self, name, inputs, outputs, labor=1):
+        self.name = name
+        self.inputs = tuple(inputs.items())
+        self.outputs = tuple(outputs.items())
+        self.labor = max(1, int(labor))
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d.get("inputs", {}), d.get("outputs", {}), d.get("labor", 1))
+
+    def describe(self):
+        def goods(pairs):
+            return " + ".join(f"{q}x {'drewno' if g == ANY_LOG else g}" for g, q in pairs)
+        return f"{goods(self.inputs)} -> {goods(self.outputs)} ({self.labor} pracy/szt.)"
+
+
+def take_any(logs, n, order):
+    """Zdejmij `n` drewna dowolnych gatunków w kolejności `order`.
+
+    Zwraca {gatunek: ile} albo None (i nic nie zdejmuje), gdy drewna brakuje."""
+    if n > sum(logs.get(s, 0) for s in order):
+        return None
+    used = {}
+    for s in order:
+        if n <= 0:
+            break
+        k = min(logs.get(s, 0), n)
+        if k:
+            logs[s] -= k
+            used[s] = k
+            n -= k
+    return used
+
+
+class Workshop:
+    def __init__(self, recipes, species, furniture, capacity=WORKSHOP_CAPACITY, log_order=None):
+        self.recipes = {r.name: r for r in recipes}
+        self.species = set(species)
+        self.log_order = list(log_order or species)
+        self.furniture = set(furniture)
+        self.capacity = capacity
+        self.stock = {}   # półprodukty (deski)
+        self.jobs = []    # [recipe name, remaining, progress]
+        # first recipe producing each intermediate good (used to queue missing parts)
+        self.producers = {}
+        for r in recipes:
+            for good, _ in r.outputs:
+                if good not in self.furniture:
+                    self.producers.setdefault(good, r)
+
+    # ---------------- queue ----------------
+    def planned(self, good):
+        """Magazyn + to, co kolejka jeszcze wyprodukuje, minus to, co zużyje."""
+        total = self.stock.get(good, 0)
+        for name, remaining, _ in self.jobs:
+            r = self.recipes.get(name)
+            if r is None:
+                continue
+            total += remaining * (sum(q for g, q in r.outputs if g == good) - sum(q for g, q in r.inputs if g == good))
+        return total
+
+    def enqueue(self, name, qty, with_parts=True):
+        """Dodaj zlecenie. Z `with_parts` najpierw zlecenia na brakujące półprodukty.
+
+        Zwraca listę dodanych zleceń [(receptura, ile), ...]."""
+        recipe = self.recipes[name]
+        added = []
+        if with_parts:
+            for good, q in recipe.inputs:
+                producer = self.producers.get(good)
+                if producer is None:
+                    continue
+                short = q * qty - self.planned(good)
+                if short > 0:
+                    per_piece = sum(out for g, out in producer.outputs if g == good)
+                    added += self.enqueue(producer.name, -(-short // per_piece), with_parts)
+        self.jobs.append([name, qty, 0])
+        added.append((name, qty))
+        return added
+
+    def cancel(self, index):
+        """Usuń zlecenie (wejścia zużywamy dopiero przy wykonaniu, więc nic nie przepada)."""
+        if 0 <= index < len(self.jobs):
+            del self.jobs[index]
+
+    def expand(self, steps=1):
+        self.capacity += steps * CAPACITY_STEP
+
+    # ---------------- daily processing ----------------
+    def available(self, good, logs):
+        if good == ANY_LOG:
+            return sum(logs.get(s, 0) for s in self.log_order)
+        if good in self.species:
+            return logs.get(good, 0)
+        return self.stock.get(good, 0)
+
+    def _take(self, good, n, logs, used):
+        if good == ANY_LOG:
+            for s, k in take_any(logs, n, self.log_order).items():
+                used[s] = used.get(s, 0) + k
+        elif good in self.species:
+            logs[good] -= n
+            used[good] = used.get(good, 0) + n
+        else:
+            self.stock[good] -= n
+
+    def run_day(self, logs):
+        """Dzień pracy warsztatu; drewno zdejmuje z `logs` (słownik gry).
+
+        Zwraca (wykonane {wyjście: ile}, zużyte drewno {gatunek: ile})."""
+        capacity = self.capacity
+        made = {}
+        used = {}
+        for job in self.jobs:
+            if capacity <= 0:
+                break
+            name, remaining, progress = job
+            recipe = self.recipes.get(name)
+            if recipe is None:
+                job[1] = 0  # recipe removed with a mod
+                continue
+            by_inputs = min((self.available(g, logs) // q for g, q in recipe.inputs), default=remaining)
+            budget = capacity + progress
+            n = min(remaining, by_inputs, budget // recipe.labor)
+            if n:
+                for good, q in recipe.inputs:
+                    self._take(good, n * q, logs, used)
+                for good, q in recipe.outputs:
+                    made[good] = made.get(good, 0) + n * q
+                    if good not in self.furniture:
+                        self.stock[good] = self.stock.get(good, 0) + n * q
+                job[1] = remaining = remaining - n
+            if remaining and by_inputs > n:
+                # out of work for today: the rest goes into the next piece
+                job[2] = budget - n * recipe.labor
+                capacity = 0
+            elif n:
+                job[2] = 0
+                capacity = budget - n * recipe.labor
+        self.jobs = [job for job in self.jobs if job[1] > 0]
+        return made, used
+
+    def queue_lines(self):
+        lines = []
+        for name, remaining, progress in self.jobs:
+            r = self.recipes.get(name)
+            line = f"{name}: {remaining} szt."
+            if r is not None and progress:
+                line += f" (następna: {progress}/{r.labor} pracy)"
+            lines.append(line)
+        return lines
+
+    # ---------------- save / load ----------------
+    def to_dict(self):
+        return {"capacity": self.capacity, "stock": dict(self.stock), "jobs": [list(j) for j in self.jobs]}
+
+    def load_dict(self, data):
+        self.capacity = data.get("capacity", self.capacity)
+        self.stock = dict(data.get("stock", {}))
+        self.jobs = [list(j) for j in data.get("jobs", []) if j and j[0] in self.recipes]
+        return self
@@ -0,0 +1,258 @@
+"""Przegląd parametrów polityki podatkowej na wielu rdzeniach.
+
+Każdy punkt siatki to seria gier `drzewo.py` bez okna (patrz bezglowy.py),
+rozgrywanych prostą strategią gracza z ustalonymi ziarnami losowania. Dla
+każdego punktu raportujemy odsetek bankructw i rozkład majątku (pieniądze - dług).
+
+Tryb `optimize` szuka ustawień dających zadany poziom trudności (odsetek
+bankructw) metodą successive halving: wiele losowych kandydatów na małej liczbie
+ziaren, potem tylko najlepsza 1/eta z coraz większą liczbą ziaren.
+
+Przykłady:
+    python symulacja.py sweep --income_tax_rate 0.05:0.3:4 --FIRE_CHANCE_PER_DAY 0.04,0.08
+    python symulacja.py optimize --target 0.25 --candidates 27
+    python symulacja.py sweep --seeds 50 --db analityka.db   # dni do bazy (patrz analityka.py)
+"""
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import bezglowy
+
+# parameters set on the game instance vs module-level constants of drzewo.py
+GAME_PARAMS = ("income_tax_rate", "property_tax_per_tree", "property_tax_per_furniture")
+MODULE_PARAMS = ("LOAN_INTEREST_RATE", "FIRE_CHANCE_PER_DAY", "MARKET_VOLATILITY")
+INT_PARAMS = ("property_tax_per_tree", "property_tax_per_furniture")
+
+DEFAULT_SPACE = {
+    "income_tax_rate": (0.0, 0.5),
+    "property_tax_per_tree": (0, 5),
+    "property_tax_per_furniture": (0, 10),
+    "LOAN_INTEREST_RATE": (0.05, 0.6),
+    "FIRE_CHANCE_PER_DAY": (0.0, 0.25),
+    "MARKET_VOLATILITY": (0.0, 0.5),
+}
+
+BANKRUPTCY_DEBT = 1000   # dług, od którego uznajemy grę za przegraną
+DEFAULT_DAYS = 100
+MIN_SEEDS = 4            # optimize: ziarna na kandydata w pierwszej rundzie successive halving
+CUT_PER_DAY = 3          # strategia: ile drzew każdego gatunku ścinamy dziennie
+LOAN_WHEN_BELOW = 30     # strategia: pożyczka 100 zł, gdy pieniądze spadną poniżej tej kwoty
+
+
+_warehouses = {}  # per process: ścieżka bazy -> analityka.Warehouse
+
+
+def _warehouse(db):
+    if db not in _warehouses:
+        from analityka import Warehouse
+        _warehouses[db] = Warehouse(db)
+    return _warehouses[db]
+
+
+class DayRecorder:
+    """Dzienne wiersze gry `drzewo.py` do bazy analitycznej (gra sama nic nie zapisuje)."""
+
+    def __init__(self, warehouse, game, params, seed):
+        self.warehouse = warehouse
+        self.game = game
+        self.species = list(game.trees)
+        self.run_id = warehouse.new_run("symulacja", seed=seed, params=params)
+        self._tax_seen = game.income_tax_paid
+
+    def end_day(self):
+        game = self.game
+        # property tax and regrowth are deterministic, so the rest of the tree loss is fire
+        property_tax = sum(game.taxes.property_tax())
+        expected_trees = sum(game.trees.values()) + len(game.trees)
+        game.end_day()
+        trees = [game.trees[n] for n in self.species]
+        self.warehouse.record_day(
+            self.run_id, game.day, game.money, game.debt, self.species, trees,
+            [game.logs.get(n, 0) for n in self.species], [game.market_prices[n] for n in self.species],
+            income_tax=game.income_tax_paid - self._tax_seen, property_tax=property_tax,
+            fire_loss=max(0, expected_trees - sum(trees)))
+        self._tax_seen = game.income_tax_paid
+
+
+def play_one(params, seed, days=DEFAULT_DAYS, db=None):
+    """Jedna gra: zwraca (zbankrutował, majątek końcowy). Z `db` dni trafiają do bazy analitycznej."""
+    module = bezglowy.load_drzewo()
+    constants = {k: v for k, v in params.items() if k in MODULE_PARAMS}
+    # the rules read these constants while the game runs, so they stay patched until it ends
+    with bezglowy.module_constants(module, **constants):
+        game = bezglowy.new_game(module, seed=seed)
+        for key in GAME_PARAMS:
+            if key in params:
+                setattr(game, key, params[key])
+        recorder = DayRecorder(_warehouse(db), game, params, seed) if db else None
+        try:
+            return _play(game, days, recorder)
+        finally:
+            if recorder:
+                recorder.warehouse.flush()
+
+
+def _play(game, days, recorder):
+    for _ in range(days):
+        if not game.jail:
+            for name in list(game.trees):
+                game.selected_tree = name
+                for _ in range(min(CUT_PER_DAY, game.trees.get(name, 0))):
+                    game.cut_tree()
+            game.sell_all_logs()
+            if game.money < LOAN_WHEN_BELOW and game.debt < BANKRUPTCY_DEBT // 2:
+                game.take_loan(100)
+        if recorder:
+            recorder.end_day()
+        else:
+            game.end_day()
+        if game.debt >= BANKRUPTCY_DEBT:
+            return True, game.money - game.debt
+    return False, game.money - game.debt
+
+
+def _run_task(task):
+    params, seed, days, db = task
+    return play_one(params, seed, days, db)
+
+
+def summarize(params, outcomes):
+    wealth = sorted(w for _, w in outcomes)
+    n = len(wealth)
+    def pct(p):
+        return wealth[min(n - 1, int(p * n))] if n else 0
+    return {
+        "params": params,
+        "games": n,
+        "bankruptcy_rate": sum(1 for b, _ in outcomes if b) / n if n else 0.0,
+        "wealth_mean": sum(wealth) / n if n else 0.0,
+        "wealth_p10": pct(0.10),
+        "wealth_p50": pct(0.50),
+        "wealth_p90": pct(0.90),
+    }
+
+
+def evaluate(configs, seeds, days=DEFAULT_DAYS, workers=None, pool=None, db=None):
+    """Rozegraj każdą konfigurację na każdym ziarnie. Zwraca listę wyników (per konfiguracja)."""
+    tasks = [(params, seed, days, db) for params in configs for seed in seeds]
+    own_pool = pool is None
+    pool = pool or ProcessPoolExecutor(max_workers=workers)
+    try:
+        chunk = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+        outcomes = list(pool.map(_run_task, tasks, chunksize=chunk))
+    finally:
+        if own_pool:
+            pool.shutdown()
+    per = len(seeds)
+    return [outcomes[i * per:(i + 1) * per] for i in range(len(configs))]
+
+
+def grid(ranges):
+    """Iloczyn kartezjański {parametr: [wartości]} -> lista słowników."""
+    configs = [{}]
+    for key, values in ranges.items():
+        configs = [dict(c, **{key: v}) for c in configs for v in values]
+    return configs
+
+
+def sweep(ranges, seeds=20, days=DEFAULT_DAYS, workers=None, db=None):
+    configs = grid(ranges)
+    results = evaluate(configs, list(range(seeds)), days, workers, db=db)
+    return [summarize(c, r) for c, r in zip(configs, results)]
+
+
+def sample_config(space, rng):
+    config = {}
+    for key, (lo, hi) in space.items():
+        v = rng.uniform(lo, hi)
+        config[key] = int(round(v)) if key in INT_PARAMS else round(v, 4)
+    return config
+
+
+def optimize(target, space=None, candidates=27, eta=3, min_seeds=MIN_SEEDS, days=DEFAULT_DAYS, workers=None, seed=0):
+    """Successive halving: znajdź ustawienia z odsetkiem bankructw najbliższym `target`.
+
+    Wyniki z poprzednich rund są zachowywane - w kolejnej rundzie dogrywamy tylko
+    nowe ziarna. Zwraca (najlepszy wynik, liczba rozegranych gier)."""
+    rng = random.Random(seed)
+    space = space or DEFAULT_SPACE
+    alive = [sample_config(space, rng) for _ in range(candidates)]
+    outcomes = [[] for _ in alive]
+    n_seeds = min_seeds
+    games = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            new_seeds = list(range(len(outcomes[0]), n_seeds))
+            for i, res in enumerate(evaluate(alive, new_seeds, days, workers, pool)):
+                outcomes[i].extend(res)
+            games += len(alive) * len(new_seeds)
+            scored = sorted(range(len(alive)),
+                            key=lambda i: abs(summarize(alive[i], outcomes[i])["bankruptcy_rate"] - target))
+            if len(alive) <= 1:
+                break
+            keep = scored[:max(1, len(alive) // eta)]
+            alive = [alive[i] for i in keep]
+            outcomes = [outcomes[i] for i in keep]
+            n_seeds *= eta
+    return summarize(alive[0], outcomes[0]), games
+
+
+def _parse_range(text, key):
+    """'0.05:0.3:4' -> 4 równomierne wartości, '1,2,5' -> lista."""
+    cast = int if key in INT_PARAMS else float
+    if ":" in text:
+        lo, hi, n = text.split(":")
+        lo, hi, n = float(lo), float(hi), int(n)
+        values = [lo + (hi - lo) * i / max(1, n - 1) for i in range(n)]
+        return [cast(round(v)) if cast is int else round(v, 4) for v in values]
+    return [cast(v) for v in text.split(",")]
+
+
+def _print_table(results):
+    for r in results:
+        params = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+        print(f"{params or '(domyślne)'}\n    bankructwa {r['bankruptcy_rate']*100:5.1f}% | majątek śr. {r['wealth_mean']:9.1f} "
+              f"| p10 {r['wealth_p10']} | p50 {r['wealth_p50']} | p90 {r['wealth_p90']} | gier {r['games']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Przegląd / optymalizacja parametrów gry bez okna.")
+    parser.add_argument("mode", choices=("sweep", "optimize"))
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--seeds", type=int, default=20, help="ziarna na punkt siatki (sweep)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--target", type=float, default=0.25, help="docelowy odsetek bankructw (optimize)")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--min-seeds", type=int, default=MIN_SEEDS, help="ziarna na kandydata w pierwszej rundzie (optimize)")
+    parser.add_argument("--json", help="zapisz wyniki do pliku JSON")
+    parser.add_argument("--db", help="zapisuj dni do bazy analitycznej SQLite (sweep), np. analityka.db")
+    for key in GAME_PARAMS + MODULE_PARAMS:
+        parser.add_argument(f"--{key}", help="zakres lo:hi:n albo lista a,b,c")
+    args = parser.parse_args(argv)
+    ranges = {k: _parse_range(getattr(args, k), k) for k in GAME_PARAMS + MODULE_PARAMS if getattr(args, k)}
+
+    if args.mode == "sweep":
+        results = sweep(ranges, args.seeds, args.days, args.workers, args.db)
+        _print_table(results)
+    else:
+        space = {k: (min(v), max(v)) for k, v in ranges.items()} or None
+        best, games = optimize(args.target, space, args.candidates, args.eta, args.min_seeds, days=args.days, workers=args.workers)
+        rounds, n = 0, args.candidates
+        while n > 1:
+            n //= args.eta
+            rounds += 1
+        full = args.candidates * args.min_seeds * args.eta ** rounds
+        print(f"Rozegrano {games} gier (pełna ocena wszystkich kandydatów: ~{full}).")
+        results = [best]
+        _print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Doradca (boty.py) w grze bez okna."""
+import bezglowy
+import boty
+
+
+def _empty_game():
+    module = bezglowy.load_drzewo()
+    game = bezglowy.new_game(module, seed=1)
+    game.trees = {name: 0 for name in game.trees}
+    game.logs = {name: 0 for name in game.logs}
+    game.money = 500
+    game.debt = 0
+    return module, game
+
+
+def test_advise_with_only_end_day_legal():
+    module, game = _empty_game()
+    action, _, stats = boty.advise(game, vars(module))
+    assert action == ("end_day",)
+    assert stats["rollouts"] == 0
+    assert [a for a, _, _ in stats["actions"]] == [("end_day",)]
+
+
+def test_advisor_window_with_only_end_day_legal():
+    _, game = _empty_game()
+    game.open_advisor()
@@ -0,0 +1,23 @@
+"""Produkcja ekipy (pracownicy.py)."""
+import random
+
+from pracownicy import WorkforceTable
+
+
+def test_idle_days_do_not_tire_the_first_team():
+    table = WorkforceTable(3)
+    for _ in range(30):
+        assert table.produce() == [0, 0, 0]
+    table.hire(2, species=1)
+    assert table.produce() == [0, 3, 0]
+    assert table.fatigue > 0
+
+
+def test_new_team_after_firing_everyone_is_fresh():
+    table = WorkforceTable(3)
+    idx = table.hire(0)
+    for _ in range(30):
+        table.produce(random.Random(1))
+    table.fire(idx)
+    table.hire(2, species=0)
+    assert table.produce() == [3, 0, 0]
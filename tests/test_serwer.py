@@ -0,0 +1,21 @@
+"""Serwer wspólnego rynku (serwer.py): odporność na złe wiadomości."""
+import asyncio
+import json
+
+import serwer
+
+
+def test_non_object_message_gets_error_and_keeps_connection():
+    async def scenario():
+        server = await serwer.MarketServer(host="127.0.0.1", port=0, tick_ms=1000, seed=1).start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"[]\n1\n" + serwer.encode({"op": "hello", "name": "test"}))
+            replies = [json.loads(await asyncio.wait_for(reader.readline(), 2)) for _ in range(3)]
+            writer.close()
+            return replies
+        finally:
+            await server.stop()
+
+    replies = asyncio.run(scenario())
+    assert [r["op"] for r in replies] == ["error", "error", "welcome"]
@@ -0,0 +1,18 @@
+"""Wycinka w kod: wydajność gatunku z rejestru zawartości."""
+from array import array
+
+import bezglowy
+
+
+def test_cut_tree_scales_by_species_yield(monkeypatch):
+    module = bezglowy.load_kod()
+    game = bezglowy.new_game(module, seed=1)
+    game.selected_tree = "Dąb"
+    before = game.logs.get("Dąb", 0)
+    game.cut_tree()
+    base = game.logs["Dąb"] - before
+    yields = array("q", module.CONTENT.yield_)
+    yields[module.CONTENT.index["Dąb"]] = 2
+    monkeypatch.setattr(module.CONTENT, "yield_", yields)
+    game.cut_tree()
+    assert game.logs["Dąb"] - before - base == 2 * base
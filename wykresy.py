@@ -0,0 +1,258 @@
+"""Wykresy liniowe na Canvas dla długich historii (ceny, pieniądze, dług, drzewa).
+
+Każda seria trzyma piramidę min/max: poziom 0 to surowe wartości, poziom k ma
+minimum i maksimum bloków po FANOUT**k dni. Dopisanie dnia poprawia po jednym
+wpisie na poziom. Rysowanie wybiera poziom, na którym blok to najwyżej jedna
+kolumna pikseli, i czyta tylko bloki z widocznego zakresu - koszt zależy od
+szerokości wykresu, a nie od długości historii.
+
+Seria to jedna linia na płótnie (w każdej kolumnie pikseli zygzak min-max, więc
+skoki cen nie giną przy pomniejszeniu). Elementy Canvas tworzymy raz, a przy
+odświeżaniu zmieniamy tylko ich współrzędne i teksty. Nowe dni dopisujemy do
+piramidy (`sync`), a przerysowanie jest odkładane do `after_idle`, więc wiele dni
+naraz (przewijanie) to jedno przerysowanie.
+
+Kółko myszy przybliża/oddala wokół kursora, przeciąganie przesuwa widok,
+dwuklik wraca do całej historii. Gdy widok sięga ostatniego dnia, przesuwa się
+sam razem z nowymi dniami.
+"""
+import math
+from array import array
+
+FANOUT = 4
+MIN_VISIBLE_DAYS = 10
+ZOOM_STEP = 0.8
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 56, 10, 20, 18
+
+
+class Series:
+    __slots__ = ("name", "color", "mins", "maxs", "offset")
+
+    def __init__(self, name, color, values=()):
+        self.name = name
+        self.color = color
+        self.offset = 0  # day of the first value (series that started later, e.g. species from a mod)
+        self.reset(values)
+
+    def __len__(self):
+        return len(self.mins[0])
+
+    def reset(self, values=()):
+        raw = array("d", values)
+        self.mins = [raw]
+        self.maxs = [raw]  # level 0: min == max == the value
+        while len(self.mins[-1]) > FANOUT:
+            lo, hi = self.mins[-1], self.maxs[-1]
+            self.mins.append(array("d", (min(lo[j:j + FANOUT]) for j in range(0, len(lo), FANOUT))))
+            self.maxs.append(array("d", (max(hi[j:j + FANOUT]) for j in range(0, len(hi), FANOUT))))
+
+    def append(self, value):
+        value = float(value)
+        raw = self.mins[0]
+        raw.append(value)
+        i = len(raw) - 1
+        for k in range(1, len(self.mins)):
+            i //= FANOUT
+            lo, hi = self.mins[k], self.maxs[k]
+            if i == len(lo):
+                lo.append(value)
+                hi.append(value)
+            else:
+                if value < lo[i]:
+                    lo[i] = value
+                if value > hi[i]:
+                    hi[i] = value
+        top_lo, top_hi = self.mins[-1], self.maxs[-1]
+        if len(top_lo) > FANOUT:
+            self.mins.append(array("d", (min(top_lo[j:j + FANOUT]) for j in range(0, len(top_lo), FANOUT))))
+            self.maxs.append(array("d", (max(top_hi[j:j + FANOUT]) for j in range(0, len(top_hi), FANOUT))))
+
+    def envelope(self, start, stop, buckets):
+        """[(kolumna, min, max), ...] dla wartości [start, stop) podzielonych na `buckets` kolumn.
+
+        `start` może być ujemny (widok zaczyna się przed pierwszą wartością serii)."""
+        stop = min(stop, len(self))
+        if stop <= start or buckets <= 0:
+            return []
+        per = (stop - start) / buckets  # days per column
+        k, size = 0, 1
+        while k + 1 < len(self.mins) and size * FANOUT <= per:
+            k += 1
+            size *= FANOUT
+        lo, hi = self.mins[k], self.maxs[k]
+        end = min(len(lo), -(-stop // size))
+        out = []
+        first = max(0, start // size)
+        for col in range(buckets):
+            # blocks starting before the end of this column (a block is drawn where it starts)
+            last = min(end, math.ceil((start + (col + 1) * per) / size))
+            if last > first:
+                out.append((col, min(lo[first:last]), max(hi[first:last])))
+                first = last
+        return out
+
+
+class Chart:
+    """Wykres kilku serii na jednym Canvas; `tk` to moduł tkinter gry."""
+
+    def __init__(self, master, tk, series, width=560, height=220, title="", bg="#1A1A1A", fg="#DDDDDD"):
+        self.tk = tk
+        self.series = series
+        self.width = width
+        self.height = height
+        self.title = title
+        self.epoch = None     # history generation of the synced lists (see sync)
+        self.view = None      # (start, stop); None = everything
+        self.follow = True    # the view ends at the last day and moves with new days
+        self._pending = None
+        self._drag_x = None
+        c = self.canvas = tk.Canvas(master, width=width, height=height, bg=bg, highlightthickness=0)
+        self._frame = c.create_rectangle(0, 0, 0, 0, outline="#555555")
+        self._lines = [c.create_line(0, 0, 0, 0, fill=s.color, width=1) for s in series]
+        self._labels = {key: c.create_text(0, 0, fill=fg, font=("Helvetica", 8), anchor=anchor)
+                        for key, anchor in (("title", "nw"), ("y_max", "ne"), ("y_min", "se"),
+                                            ("x_min", "nw"), ("x_max", "ne"), ("legend", "ne"))}
+        c.bind("<Configure>", lambda e: self.schedule())
+        c.bind("<MouseWheel>", lambda e: self.zoom(ZOOM_STEP if e.delta > 0 else 1 / ZOOM_STEP, e.x))
+        c.bind("<Button-4>", lambda e: self.zoom(ZOOM_STEP, e.x))
+        c.bind("<Button-5>", lambda e: self.zoom(1 / ZOOM_STEP, e.x))
+        c.bind("<ButtonPress-1>", self._press)
+        c.bind("<B1-Motion>", self._drag)
+        c.bind("<Double-Button-1>", lambda e: self.show_all())
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+        return self
+
+    # ---------------- data ----------------
+    def length(self):
+        return max((s.offset + len(s) for s in self.series), default=0)
+
+    def sync(self, lists, epoch=0):
+        """Dopisz do serii nowe dni z `lists` (lista na serię, wszystkie kończą się dziś -
+        krótsza lista to seria, która zaczęła się później). Zmiana `epoch` (historia
+        została przycięta) albo krótsza lista - budujemy serie od nowa."""
+        longest = max((len(v) for v in lists), default=0)
+        offsets = [longest - len(v) for v in lists]
+        rebuild = epoch != self.epoch or any(len(v) < len(s) or off != s.offset
+                                             for s, v, off in zip(self.series, lists, offsets))
+        for s, values, off in zip(self.series, lists, offsets):
+            if rebuild:
+                s.offset = off
+                s.reset(values)
+            else:
+                for v in values[len(s):]:
+                    s.append(v)
+        self.epoch = epoch
+        self.schedule()
+
+    # ---------------- view ----------------
+    def visible(self):
+        n = self.length()
+        if self.view is None:
+            return 0, n
+        start, stop = self.view
+        if self.follow:
+            span = stop - start
+            return max(0, n - span), n
+        return start, stop
+
+    def _plot_size(self):
+        try:
+            w, h = int(self.canvas.winfo_width()), int(self.canvas.winfo_height())
+        except (TypeError, ValueError):
+            w, h = 0, 0
+        if w <= 1 or h <= 1:  # not mapped yet (or no display): configured size
+            w, h = self.width, self.height
+        return w, h
+
+    def _set_view(self, start, stop):
+        n = self.length()
+        span = min(max(MIN_VISIBLE_DAYS, stop - start), max(n, 1))
+        start = min(max(0, start), max(0, n - span))
+        self.follow = start + span >= n
+        self.view = None if span >= n else (start, start + span)
+        self.schedule()
+
+    def zoom(self, factor, x=None):
+        start, stop = self.visible()
+        w, _ = self._plot_size()
+        plot_w = max(1, w - MARGIN_LEFT - MARGIN_RIGHT)
+        frac = 1.0 if x is None or self.follow else min(1.0, max(0.0, (x - MARGIN_LEFT) / plot_w))
+        anchor = start + frac * (stop - start)
+        span = (stop - start) * factor
+        self._set_view(int(round(anchor - frac * span)), int(round(anchor - frac * span + span)))
+
+    def pan(self, days):
+        start, stop = self.visible()
+        self._set_view(start + days, stop + days)
+
+    def show_all(self):
+        self.view = None
+        self.follow = True
+        self.schedule()
+
+    def _press(self, event):
+        self._drag_x = event.x
+
+    def _drag(self, event):
+        if self._drag_x is None:
+            return
+        start, stop = self.visible()
+        w, _ = self._plot_size()
+        days = int((self._drag_x - event.x) * (stop - start) / max(1, w - MARGIN_LEFT - MARGIN_RIGHT))
+        if days:
+            self._drag_x = event.x
+            self.pan(days)
+
+    # ---------------- drawing ----------------
+    def schedule(self):
+        if self._pending is None:
+            self._pending = self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        self._pending = None
+        c = self.canvas
+        w, h = self._plot_size()
+        x0, y0, x1, y1 = MARGIN_LEFT, MARGIN_TOP, w - MARGIN_RIGHT, h - MARGIN_BOTTOM
+        columns = max(1, int(x1 - x0))
+        start, stop = self.visible()
+        envelopes = [s.envelope(start - s.offset, stop - s.offset, columns) for s in self.series]
+        lows = [lo for env in envelopes for _, lo, _ in env]
+        highs = [hi for env in envelopes for _, _, hi in env]
+        y_min, y_max = (min(lows), max(highs)) if lows else (0.0, 1.0)
+        if y_max - y_min < 1e-9:
+            y_min, y_max = y_min - 1, y_max + 1
+        y_scale = (y1 - y0) / (y_max - y_min)
+        per_day = (x1 - x0) / max(1, stop - start)
+        for line, series, env in zip(self._lines, self.series, envelopes):
+            coords = []
+            if stop - start <= columns:
+                # one point per day
+                raw, off = series.mins[0], series.offset
+                for day in range(max(start, off), min(stop, off + len(raw))):
+                    coords += (x0 + (day - start) * per_day, y1 - (raw[day - off] - y_min) * y_scale)
+            else:
+                base = y1 + y_min * y_scale
+                for col, lo, hi in env:
+                    x = x0 + col
+                    coords += (x, base - hi * y_scale, x, base - lo * y_scale)
+            if len(coords) < 4:
+                coords = [0, 0, 0, 0]
+            c.coords(line, *coords)
+        c.coords(self._frame, x0, y0, x1, y1)
+        texts = {
+            "title": (x0, 3, self.title),
+            "y_max": (x0 - 4, y0, _fmt(y_max)),
+            "y_min": (x0 - 4, y1, _fmt(y_min)),
+            "x_min": (x0, y1 + 2, f"dzień {start + 1}"),
+            "x_max": (x1, y1 + 2, f"dzień {stop}" + (" (na żywo)" if self.follow else "")),
+            "legend": (x1, 3, "  ".join(s.name for s in self.series)),
+        }
+        for key, (x, y, text) in texts.items():
+            c.coords(self._labels[key], x, y)
+            c.itemconfigure(self._labels[key], text=text)
+
+
+def _fmt(value):
+    return f"{value:,.0f}".replace(",", " ") if abs(value) >= 100 else f"{value:.1f}"
@@ -0,0 +1,76 @@
+"""Odczyt zapisu w tle przy starcie gry.
+
+Na początku zapisu leży mały nagłówek (`save_header`: dzień, pieniądze, dług,
+czas zapisu). Przy starcie gra od razu pokazuje okno, a wątek w tle czyta tylko
+początek pliku, żeby wyświetlić pasek "wznów grę", po czym parsuje cały plik -
+kliknięcie "Wczytaj" nie czeka już na JSON. Tk nie jest bezpieczny wątkowo,
+więc gra sama odpytuje `SaveProbe` przez `after`.
+"""
+import json
+import re
+import threading
+
+HEADER_KEY = "save_header"
+HEADER_CHUNK = 4096  # the header is written first, so it always fits in the first few KB
+
+_HEADER_RE = re.compile(r'"%s"\s*:\s*(\{[^{}]*\})' % HEADER_KEY)
+
+
+def make_header(state):
+    return {k: state.get(k) for k in ("day", "money", "debt", "last_saved_at")}
+
+
+def read_header(path):
+    """Nagłówek zapisu z początku pliku albo None (stare zapisy bez nagłówka)."""
+    with open(path, "r", encoding="utf-8") as f:
+        chunk = f.read(HEADER_CHUNK)
+    match = _HEADER_RE.search(chunk)
+    return json.loads(match.group(1)) if match else None
+
+
+def describe_header(header):
+    if not header:
+        return "Znaleziono zapis gry."
+    text = f"Znaleziono zapis: dzień {header.get('day')}, {header.get('money')} zł"
+    if header.get("debt"):
+        text += f", dług {header['debt']} zł"
+    if header.get("last_saved_at"):
+        text += f" (zapisano {header['last_saved_at'][:16].replace('T', ' ')})"
+    return text + "."
+
+
+class SaveProbe:
+    """Wątek czytający nagłówek, a potem cały zapis. Stan odczytujemy z wątku Tk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.header_ready = False
+        self.data = None
+        self.error = None
+        self.done = False
+        self._thread = threading.Thread(target=self._run, name="save-probe", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def _run(self):
+        try:
+            self.header = read_header(self.path)
+        except Exception:
+            self.header = None
+        self.header_ready = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if self.header is None:
+                self.header = make_header(data)
+            self.data = data
+        except Exception as e:
+            self.error = e
+        self.done = True
@@ -0,0 +1,116 @@
+"""Rejestr zawartości gry: gatunki drzew i przedmioty (meble) z pliku danych.
+
+Dane leżą w `zawartosc.json` (gatunki, meble, receptury stolarni - patrz
+stolarnia.py - i osiągnięcia - patrz osiagniecia.py); mody to dodatkowe pliki w tym samym formacie,
+podane w zmiennej LAS_MODY (rozdzielone os.pathsep). Wpis moda o istniejącej
+nazwie nadpisuje podane pola, nowa nazwa dopisuje gatunek/przedmiot/recepturę/osiągnięcie
+na końcu.
+
+Przy ładowaniu każda nazwa dostaje mały, stały numer (kolejność z pliku), a każda
+cecha leży w osobnej ciągłej tablicy indeksowanej tym numerem (`price[sid]`,
+`fuel[sid]`, `yield_[sid]`), więc reguły gry nie przeszukują słowników, a koszt
+akcji nie rośnie z liczbą gatunków. Słowniki w starym formacie (`tree_types()`,
+`price_table()`, ...) budujemy z rejestru raz - zapis gry, boty i symulacje dalej
+pracują na nazwach.
+
+    python zawartosc.py                      # podsumowanie (z modami z LAS_MODY)
+"""
+import json
+import os
+from array import array
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, "zawartosc.json")
+ENV_VAR = "LAS_MODY"
+
+SPECIES_DEFAULTS = {"color": "#888888", "price": 10, "fuel": 0, "yield": 1}
+ITEM_DEFAULTS = {"cost": 1, "icon": "📦"}
+RECIPE_DEFAULTS = {"inputs": {}, "outputs": {}, "labor": 1}
+ACHIEVEMENT_DEFAULTS = {"kind": "count", "goal": 1, "icon": "🏆", "description": ""}
+
+
+class Registry:
+    __slots__ = ("species", "index", "color", "price", "fuel", "yield_",
+                 "items", "item_index", "item_cost", "item_icon", "recipes", "achievements", "sources")
+
+    def __init__(self, species, items, recipes=(), sources=(), achievements=()):
+        self.species = [s["name"] for s in species]
+        self.index = {name: sid for sid, name in enumerate(self.species)}
+        self.color = [s["color"] for s in species]
+        self.price = array("q", (int(s["price"]) for s in species))
+        self.fuel = array("q", (int(s["fuel"]) for s in species))
+        self.yield_ = array("q", (int(s["yield"]) for s in species))
+        self.items = [i["name"] for i in items]
+        self.item_index = {name: iid for iid, name in enumerate(self.items)}
+        self.item_cost = array("q", (int(i["cost"]) for i in items))
+        self.item_icon = [i["icon"] for i in items]
+        self.recipes = list(recipes)  # dicts; stolarnia.Recipe.from_dict builds the engine's view
+        self.achievements = list(achievements)  # dicts; osiagniecia.Rule.from_dict
+        self.sources = list(sources)
+
+    def __len__(self):
+        return len(self.species)
+
+    def sid(self, name, default=None):
+        return self.index.get(name, default)
+
+    # ---------------- legacy dict views (built once per game module) ----------------
+    def tree_types(self):
+        return [{"name": n, "color": c} for n, c in zip(self.species, self.color)]
+
+    def price_table(self):
+        return dict(zip(self.species, self.price))
+
+    def fuel_table(self):
+        return dict(zip(self.species, self.fuel))
+
+    def furniture_types(self):
+        return {n: {"cost": c, "icon": i} for n, c, i in zip(self.items, self.item_cost, self.item_icon)}
+
+
+def _merge(entries, extra, defaults, kind, source):
+    by_name = {e["name"]: e for e in entries}
+    for entry in extra:
+        name = entry.get("name")
+        if not name:
+            raise ValueError(f"{source}: {kind} bez nazwy: {entry!r}")
+        if name in by_name:
+            by_name[name].update(entry)
+        else:
+            by_name[name] = {**defaults, **entry}
+            entries.append(by_name[name])
+
+
+def load(path=DEFAULT_PATH, mods=None):
+    """Rejestr z pliku bazowego i modów (domyślnie z LAS_MODY)."""
+    if mods is None:
+        mods = [p for p in os.environ.get(ENV_VAR, "").split(os.pathsep) if p]
+    species, items, recipes, achievements = [], [], [], []
+    for source in [path, *mods]:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _merge(species, data.get("species", []), SPECIES_DEFAULTS, "gatunek", source)
+        _merge(items, data.get("items", []), ITEM_DEFAULTS, "przedmiot", source)
+        _merge(recipes, data.get("recipes", []), RECIPE_DEFAULTS, "receptura", source)
+        _merge(achievements, data.get("achievements", []), ACHIEVEMENT_DEFAULTS, "osiągnięcie", source)
+    if not species:
+        raise ValueError(f"{path}: brak gatunków drzew")
+    return Registry(species, items, recipes, [path, *mods], achievements)
+
+
+if __name__ == "__main__":
+    registry = load()
+    print("Źródła:", ", ".join(registry.sources))
+    print(f"Gatunki ({len(registry)}):")
+    for sid, name in enumerate(registry.species):
+        print(f"  {sid:3d} {name:12s} cena {registry.price[sid]:4d} opał {registry.fuel[sid]:3d} "
+              f"drewno/drzewo {registry.yield_[sid]} {registry.color[sid]}")
+    print(f"Przedmioty ({len(registry.items)}):")
+    for iid, name in enumerate(registry.items):
+        print(f"  {iid:3d} {registry.item_icon[iid]} {name:12s} koszt {registry.item_cost[iid]}")
+    print(f"Receptury ({len(registry.recipes)}):")
+    for recipe in registry.recipes:
+        print(f"  {recipe['name']:14s} {recipe['inputs']} -> {recipe['outputs']} (praca {recipe['labor']})")
+    print(f"Osiągnięcia ({len(registry.achievements)}):")
+    for a in registry.achievements:
+        print(f"  {a['icon']} {a['name']:16s} {a['event']}/{a['kind']} >= {a['goal']}")